@@ -0,0 +1,157 @@
+import os
+import json
+import math
+import time
+import asyncio
+import argparse
+from typing import Dict, List, Set
+
+from langchain_google_genai import ChatGoogleGenerativeAI
+from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.output_parsers import StrOutputParser
+from dotenv import load_dotenv
+from llm_cache import shared_llm_cache
+
+# Load environment variables from .env file
+load_dotenv()
+
+llm_cache = shared_llm_cache()
+
+llm = ChatGoogleGenerativeAI(model="gemini-2.5-pro", api_key=os.getenv("GEMINI_API_KEY"), cache=llm_cache)
+
+# Prompt 1 - Extract Information
+prompt_extract = ChatPromptTemplate.from_template(
+    "Extract the technical specifications from the following text: \n\n{text_input}"
+)
+
+# Prompt 2 - Transform to JSON
+prompt_transform = ChatPromptTemplate.from_template(
+    "Transform the following specifications into a JSON object with 'cpu', 'memory', and 'storage' as keys: \n\n{specifications}"
+)
+
+extraction_chain = prompt_extract | llm | StrOutputParser()
+
+full_chain = (
+    {"specifications": extraction_chain}
+    | prompt_transform
+    | llm
+    | StrOutputParser()
+)
+
+
+def load_completed_ids(output_path: str) -> Set[str]:
+    """Read the ids already written to the output file.
+
+    The output file doubles as the checkpoint: every finished record is
+    appended and flushed, so a restarted run skips everything found here.
+    """
+    completed = set()
+    if not os.path.exists(output_path):
+        return completed
+    with open(output_path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                completed.add(str(json.loads(line)["id"]))
+            except (json.JSONDecodeError, KeyError):
+                # A partially written last line from an interrupted run.
+                continue
+    return completed
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+async def read_records(input_path: str, queue: asyncio.Queue, completed: Set[str], workers: int, errors: Dict[str, str]) -> int:
+    """Stream records from the JSONL input into the bounded work queue.
+
+    Malformed lines and records without "text" are counted as failed and
+    skipped, like records whose chain raises, so one bad line does not stop the run.
+    """
+    skipped = 0
+    with open(input_path, "r", encoding="utf-8") as f:
+        for line_number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+                problem = None if isinstance(record, dict) and "text" in record else 'missing "text"'
+            except json.JSONDecodeError as e:
+                record, problem = {}, f"invalid JSON: {e}"
+            record_id = str(record.get("id", line_number)) if isinstance(record, dict) else str(line_number)
+            if problem:
+                errors[record_id] = f"line {line_number}: {problem}"
+                print(f"Record {record_id} failed: {errors[record_id]}")
+                continue
+            if record_id in completed:
+                skipped += 1
+                continue
+            # Blocks while the queue is full, so the input is never loaded at once.
+            await queue.put((record_id, record["text"]))
+    for _ in range(workers):
+        await queue.put(None)
+    return skipped
+
+
+async def worker(queue: asyncio.Queue, output_file, write_lock: asyncio.Lock, latencies: List[float], errors: Dict[str, str]):
+    while True:
+        item = await queue.get()
+        if item is None:
+            return
+        record_id, text = item
+        started = time.perf_counter()
+        try:
+            output = await full_chain.ainvoke({"text_input": text})
+        except Exception as e:
+            errors[record_id] = str(e)
+            print(f"Record {record_id} failed: {e}")
+            continue
+        latencies.append(time.perf_counter() - started)
+        async with write_lock:
+            output_file.write(json.dumps({"id": record_id, "output": output}) + "\n")
+            output_file.flush()
+
+
+async def run_batch(input_path: str, output_path: str, concurrency: int) -> None:
+    completed = load_completed_ids(output_path)
+    if completed:
+        print(f"Resuming: {len(completed)} records already processed")
+
+    queue = asyncio.Queue(maxsize=concurrency * 2)
+    write_lock = asyncio.Lock()
+    latencies: List[float] = []
+    errors: Dict[str, str] = {}
+
+    started = time.perf_counter()
+    with open(output_path, "a", encoding="utf-8") as output_file:
+        workers = [
+            asyncio.create_task(worker(queue, output_file, write_lock, latencies, errors))
+            for _ in range(concurrency)
+        ]
+        skipped = await read_records(input_path, queue, completed, concurrency, errors)
+        await asyncio.gather(*workers)
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    print("\n--- Batch finished ---")
+    print(f"Processed: {len(latencies)}, failed: {len(errors)}, skipped (checkpoint): {skipped}")
+    print(f"Throughput: {len(latencies) / elapsed if elapsed else 0.0:.2f} records/sec")
+    print(
+        f"Latency p50: {percentile(latencies, 50):.3f}s, "
+        f"p95: {percentile(latencies, 95):.3f}s, "
+        f"p99: {percentile(latencies, 99):.3f}s"
+    )
+    print(f"LLM cache stats: {llm_cache.stats()}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the spec-extraction chain over a JSONL corpus.")
+    parser.add_argument("input", help="JSONL file with one {\"id\": ..., \"text\": ...} record per line")
+    parser.add_argument("output", help="JSONL file results are appended to; also used as the checkpoint")
+    parser.add_argument("--concurrency", type=int, default=8, help="maximum number of chains in flight")
+    args = parser.parse_args()
+    asyncio.run(run_batch(args.input, args.output, args.concurrency))
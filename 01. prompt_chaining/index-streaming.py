@@ -0,0 +1,143 @@
+import os
+import re
+import json
+import time
+import asyncio
+from typing import AsyncIterator, Dict, List, Optional
+
+from langchain_google_genai import ChatGoogleGenerativeAI
+from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.output_parsers import StrOutputParser
+from dotenv import load_dotenv
+
+# Load environment variables from .env file
+load_dotenv()
+
+# No LLM cache here: astream bypasses LangChain's cache, so it would never be used.
+llm = ChatGoogleGenerativeAI(model="gemini-2.5-pro", api_key=os.getenv("GEMINI_API_KEY"))
+
+# Prompt 1 - Extract Information, one specification per line so that each
+# line can be handed to the next stage as soon as it is complete.
+prompt_extract = ChatPromptTemplate.from_template(
+    "Extract the technical specifications from the following text. "
+    "Write exactly one specification per line and nothing else: \n\n{text_input}"
+)
+
+# Prompt 2 - Transform a fragment of the specifications to JSON
+prompt_transform = ChatPromptTemplate.from_template(
+    "Transform the following specifications into a JSON object with 'cpu', 'memory', and 'storage' as keys. "
+    "Use null for any key that is not mentioned. Output only the JSON object: \n\n{specifications}"
+)
+
+extraction_chain = prompt_extract | llm | StrOutputParser()
+transform_chain = prompt_transform | llm | StrOutputParser()
+
+
+class StageMetrics:
+    """Tracks time to first byte and total latency of a pipeline stage."""
+
+    def __init__(self, name: str, started_at: float):
+        self.name = name
+        self.started_at = started_at
+        self.first_byte_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+    def mark_first_byte(self) -> None:
+        if self.first_byte_at is None:
+            self.first_byte_at = time.perf_counter()
+
+    def mark_finished(self) -> None:
+        self.finished_at = time.perf_counter()
+
+    def report(self) -> str:
+        ttfb = (self.first_byte_at - self.started_at) if self.first_byte_at else float("nan")
+        total = (self.finished_at - self.started_at) if self.finished_at else float("nan")
+        return f"{self.name}: time to first byte {ttfb:.3f}s, total {total:.3f}s"
+
+
+async def stream_fragments(text_input: str, metrics: StageMetrics) -> AsyncIterator[str]:
+    """Yield each extracted specification line as soon as it has streamed in."""
+    buffer = ""
+    async for chunk in extraction_chain.astream({"text_input": text_input}):
+        metrics.mark_first_byte()
+        buffer += chunk
+        *lines, buffer = buffer.split("\n")
+        for line in lines:
+            if line.strip():
+                yield line.strip()
+    if buffer.strip():
+        yield buffer.strip()
+    metrics.mark_finished()
+
+
+async def transform_fragment(fragment: str, metrics: StageMetrics) -> str:
+    """Stream the JSON transform of a fragment of one or more specification lines."""
+    output = ""
+    async for chunk in transform_chain.astream({"specifications": fragment}):
+        metrics.mark_first_byte()
+        output += chunk
+    return output
+
+
+def parse_json_object(text: str) -> Dict:
+    """Parse a JSON object from model output, tolerating markdown code fences."""
+    match = re.search(r"\{.*\}", text, re.DOTALL)
+    if not match:
+        return {}
+    try:
+        return json.loads(match.group(0))
+    except json.JSONDecodeError:
+        return {}
+
+
+def merge_fragments(parts: List[Dict]) -> Dict:
+    """Merge per-fragment JSON objects, keeping the first non-empty value per key."""
+    merged = {"cpu": None, "memory": None, "storage": None}
+    for part in parts:
+        for key, value in part.items():
+            if value not in (None, "") and merged.get(key) in (None, ""):
+                merged[key] = value
+    return merged
+
+
+async def run_streaming_chain(text_input: str) -> str:
+    """Run the two-stage chain, transforming fragments while extraction is still streaming.
+
+    At most one transform call runs while the extraction streams. Lines that
+    complete in the meantime wait and go to the next call together, so the
+    number of transform calls stays small however many lines are extracted.
+    """
+    started_at = time.perf_counter()
+    extract_metrics = StageMetrics("extract", started_at)
+    transform_metrics = StageMetrics("transform", started_at)
+
+    pending: List[asyncio.Task] = []
+    waiting: List[str] = []
+    async for fragment in stream_fragments(text_input, extract_metrics):
+        print(f"Fragment ready: {fragment}")
+        waiting.append(fragment)
+        if not pending or pending[-1].done():
+            pending.append(asyncio.create_task(transform_fragment("\n".join(waiting), transform_metrics)))
+            waiting = []
+    if waiting:
+        pending.append(asyncio.create_task(transform_fragment("\n".join(waiting), transform_metrics)))
+
+    outputs = await asyncio.gather(*pending)
+    print(f"Transform calls: {len(pending)}")
+    transform_metrics.mark_finished()
+
+    print("\nStage latency:")
+    print(extract_metrics.report())
+    print(transform_metrics.report())
+    return json.dumps(merge_fragments([parse_json_object(output) for output in outputs]), indent=2)
+
+
+async def main():
+    input_text = "The server has 4 cores, 16 GB RAM, and 1 TB storage."
+    output = await run_streaming_chain(input_text)
+
+    print("\nOutput:")
+    print(output)
+
+if __name__ == "__main__":
+    asyncio.run(main())
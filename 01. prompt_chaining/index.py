@@ -3,11 +3,17 @@ from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
 from dotenv import load_dotenv
+from llm_cache import shared_llm_cache
 
 # Load environment variables from .env file
 load_dotenv()
 
-llm = ChatGoogleGenerativeAI(model="gemini-2.5-pro", api_key=os.getenv("GEMINI_API_KEY"))
+# Cache responses on disk so repeated inputs skip the network round-trip.
+# The cache key is the model configuration plus the rendered prompt, so both
+# stages of the chain share it.
+llm_cache = shared_llm_cache()
+
+llm = ChatGoogleGenerativeAI(model="gemini-2.5-pro", api_key=os.getenv("GEMINI_API_KEY"), cache=llm_cache)
 
 # Prompt 1 - Extract Information
 prompt_extract = ChatPromptTemplate.from_template(
@@ -35,4 +41,7 @@ input_text = "The server has 4 cores, 16 GB RAM, and 1 TB storage."
 output = full_chain.invoke({"text_input": input_text})
 
 print("\nOutput:")
-print(output)   
\ No newline at end of file
+print(output)
+
+print("\nLLM cache stats:")
+print(llm_cache.stats())   
\ No newline at end of file
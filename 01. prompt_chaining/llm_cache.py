@@ -0,0 +1,164 @@
+"""
+LLM Cache - Persistent, content-addressed response cache for LangChain chat models
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from langchain_core.caches import BaseCache, RETURN_VAL_TYPE
+from langchain_core.messages import message_to_dict, messages_from_dict
+from langchain_core.outputs import ChatGeneration, Generation
+
+# Settings for the cache file shared by the prompt chain examples. Every
+# example opens it through shared_llm_cache(), so no run evicts the shared file
+# down to a smaller limit than another run uses.
+SHARED_DATABASE_PATH = "llm_cache.db"
+SHARED_MAX_ENTRIES = 100_000
+SHARED_TTL_SECONDS = 7 * 24 * 3600
+
+
+def _dump_generation(generation: Generation) -> Dict[str, Any]:
+    """Plain JSON form of a generation; chat messages use LangChain's message dicts."""
+    if isinstance(generation, ChatGeneration):
+        return {"message": message_to_dict(generation.message), "generation_info": generation.generation_info}
+    return {"text": generation.text, "generation_info": generation.generation_info}
+
+
+def _load_generation(data: Dict[str, Any]) -> Generation:
+    if "message" in data:
+        return ChatGeneration(message=messages_from_dict([data["message"]])[0], generation_info=data["generation_info"])
+    return Generation(text=data["text"], generation_info=data["generation_info"])
+
+
+class SQLiteLLMCache(BaseCache):
+    """SQLite backed LLM cache with LRU and TTL eviction.
+
+    Entries are keyed by a SHA-256 of the model configuration (``llm_string``,
+    which contains the model name) and the rendered prompt, so the same prompt
+    sent to the same model is answered from disk instead of the network.
+    Pass an instance as ``cache=`` to ``ChatGoogleGenerativeAI`` to share it
+    between every stage of a chain. Generations are stored as plain JSON, so
+    a lookup never instantiates arbitrary objects from the file.
+    """
+
+    def __init__(
+        self,
+        database_path: str = "llm_cache.db",
+        max_entries: int = 10_000,
+        ttl_seconds: Optional[float] = None,
+    ):
+        self.database_path = database_path
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        # LangChain calls the async cache methods from executor threads.
+        self._conn = sqlite3.connect(database_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS llm_cache (
+                key TEXT PRIMARY KEY,
+                llm_string TEXT NOT NULL,
+                response TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )"""
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_llm_cache_last_access ON llm_cache (last_access)"
+        )
+        self._conn.commit()
+        self._size = self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+
+    @staticmethod
+    def _key(prompt: str, llm_string: str) -> str:
+        return hashlib.sha256(f"{llm_string}\x00{prompt}".encode("utf-8")).hexdigest()
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        """Return the cached generations for the prompt, or None on a miss."""
+        key = self._key(prompt, llm_string)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, created_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and self.ttl_seconds is not None and now - row[1] > self.ttl_seconds:
+                self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                self._conn.commit()
+                self._size -= 1
+                self.evictions += 1
+                row = None
+            try:
+                generations = [_load_generation(data) for data in json.loads(row[0])] if row is not None else None
+            except (TypeError, KeyError, ValueError):
+                # Entries written in an older format are treated as misses and overwritten.
+                generations = None
+            if generations is None:
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE llm_cache SET last_access = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+        return generations
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        """Store the generations for the prompt and evict the least recently used entries."""
+        key = self._key(prompt, llm_string)
+        response = json.dumps([_dump_generation(generation) for generation in return_val], default=str)
+        now = time.time()
+        with self._lock:
+            existed = self._conn.execute(
+                "SELECT 1 FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone() is not None
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, llm_string, response, created_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, llm_string, response, now, now),
+            )
+            if not existed:
+                self._size += 1
+            if self._size > self.max_entries:
+                overflow = self._size - self.max_entries
+                self._conn.execute(
+                    "DELETE FROM llm_cache WHERE key IN "
+                    "(SELECT key FROM llm_cache ORDER BY last_access ASC LIMIT ?)",
+                    (overflow,),
+                )
+                self._size -= overflow
+                self.evictions += overflow
+            self._conn.commit()
+
+    def clear(self, **kwargs: Any) -> None:
+        """Remove every cached entry."""
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_cache")
+            self._conn.commit()
+            self._size = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters for the lifetime of this cache object."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": self._size,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+def shared_llm_cache() -> SQLiteLLMCache:
+    """Open the cache file shared by the prompt chain examples with the shared settings."""
+    return SQLiteLLMCache(SHARED_DATABASE_PATH, max_entries=SHARED_MAX_ENTRIES, ttl_seconds=SHARED_TTL_SECONDS)
+
@@ -0,0 +1,158 @@
+"""
+Fast Router - Local pre-classifier that answers high-confidence routing decisions without the LLM
+"""
+
+import json
+import math
+import os
+import re
+import threading
+import zlib
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from routing_cache import negations, normalize_request
+
+LABELS = ("booker", "info", "unclear")
+
+# Requests matching these patterns are routed without consulting the model.
+DEFAULT_RULES = [
+    (re.compile(r"\b(book|booking|reserve|reservation)\b.*\b(flight|flights|hotel|hotels|room|ticket|tickets)\b"), "booker"),
+    (re.compile(r"\b(flight|hotel)\b.*\b(book|booking|reserve|reservation)\b"), "booker"),
+]
+
+# A question that mentions booking is often an information request ("Is the
+# hotel booking policy strict?"), and a negated one ("Don't book a flight, just
+# tell me the fares") is not a booking at all, so rule matches on either are
+# not trusted.
+QUESTION_PATTERN = re.compile(
+    r"\?\s*$|^\s*(is|are|was|were|do|does|did|can|could|should|would|will|what|which|who|when|where|why|how)\b"
+)
+UNTRUSTED_RULE_CONFIDENCE = 0.5
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9']+")
+
+
+def hashed_features(text: str, n_features: int) -> Dict[int, float]:
+    """Hash lower-cased unigrams and bigrams into a sparse feature vector."""
+    tokens = TOKEN_PATTERN.findall(text.lower())
+    grams = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+    features: Dict[int, float] = {}
+    for gram in grams:
+        # crc32 is stable across processes, unlike the built-in hash().
+        index = zlib.crc32(gram.encode("utf-8")) % n_features
+        features[index] = features.get(index, 0.0) + 1.0
+    if features:
+        norm = math.sqrt(sum(v * v for v in features.values()))
+        features = {k: v / norm for k, v in features.items()}
+    return features
+
+
+class FastPathClassifier:
+    """Keyword rules plus a hashed-feature logistic regression over the router labels.
+
+    ``classify`` returns a decision only when a rule matches a request that is
+    neither a question nor negated, or the model is at least ``confidence_threshold`` sure;
+    everything else should fall through to the LLM router. Hit rate and agreement with the LLM are tracked so the
+    threshold can be tuned from logged traffic.
+    """
+
+    def __init__(
+        self,
+        confidence_threshold: float = 0.9,
+        n_features: int = 2 ** 18,
+        rules: Optional[List[Tuple[re.Pattern, str]]] = None,
+    ):
+        self.confidence_threshold = confidence_threshold
+        self.n_features = n_features
+        self.rules = DEFAULT_RULES if rules is None else rules
+        self.weights: Dict[str, Dict[int, float]] = {label: {} for label in LABELS}
+        self.bias: Dict[str, float] = {label: 0.0 for label in LABELS}
+        self.trained = False
+        self.requests = 0
+        self.fast_path_hits = 0
+        self.compared = 0
+        self.agreed = 0
+        # Comparisons are recorded from background shadow checks.
+        self._lock = threading.Lock()
+
+    def _probabilities(self, features: Dict[int, float]) -> Dict[str, float]:
+        scores = {
+            label: self.bias[label] + sum(self.weights[label].get(i, 0.0) * v for i, v in features.items())
+            for label in LABELS
+        }
+        top = max(scores.values())
+        exp_scores = {label: math.exp(score - top) for label, score in scores.items()}
+        total = sum(exp_scores.values())
+        return {label: value / total for label, value in exp_scores.items()}
+
+    def predict_proba(self, request: str) -> Dict[str, float]:
+        """Return the model's probability for each label."""
+        return self._probabilities(hashed_features(request, self.n_features))
+
+    def predict(self, request: str) -> Tuple[str, float]:
+        """Return the best label and its confidence, ignoring the threshold."""
+        text = request.lower()
+        for pattern, label in self.rules:
+            if pattern.search(text):
+                untrusted = QUESTION_PATTERN.search(text) or negations(normalize_request(request))
+                return label, UNTRUSTED_RULE_CONFIDENCE if untrusted else 1.0
+        if not self.trained:
+            return "unclear", 0.0
+        proba = self.predict_proba(request)
+        label = max(proba, key=proba.get)
+        return label, proba[label]
+
+    def classify(self, request: str) -> Optional[str]:
+        """Return a decision if the fast path is confident enough, otherwise None."""
+        self.requests += 1
+        label, confidence = self.predict(request)
+        if confidence >= self.confidence_threshold:
+            self.fast_path_hits += 1
+            return label
+        return None
+
+    def record_comparison(self, fast_decision: str, llm_decision: str) -> None:
+        """Record whether the fast path agreed with the LLM router on one request."""
+        with self._lock:
+            self.compared += 1
+            if fast_decision == llm_decision:
+                self.agreed += 1
+
+    def fit(self, examples: Iterable[Tuple[str, str]], epochs: int = 10, learning_rate: float = 0.5) -> None:
+        """Train the linear model with SGD on (request, decision) pairs."""
+        data = [(hashed_features(request, self.n_features), decision) for request, decision in examples if decision in LABELS]
+        if not data:
+            return
+        for _ in range(epochs):
+            for features, decision in data:
+                proba = self._probabilities(features)
+                for label in LABELS:
+                    gradient = proba[label] - (1.0 if label == decision else 0.0)
+                    self.bias[label] -= learning_rate * gradient
+                    label_weights = self.weights[label]
+                    for i, v in features.items():
+                        label_weights[i] = label_weights.get(i, 0.0) - learning_rate * gradient * v
+        self.trained = True
+
+    def fit_from_log(self, log_path: str, **kwargs) -> None:
+        """Train from a JSONL log of {"request": ..., "decision": ...} records."""
+        if not os.path.exists(log_path):
+            return
+        with open(log_path, "r", encoding="utf-8") as f:
+            records = [json.loads(line) for line in f if line.strip()]
+        self.fit(((r["request"], r["decision"]) for r in records), **kwargs)
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "requests": self.requests,
+            "fast_path_hits": self.fast_path_hits,
+            "hit_rate": self.fast_path_hits / self.requests if self.requests else 0.0,
+            "compared_with_llm": self.compared,
+            "agreement_rate": self.agreed / self.compared if self.compared else 0.0,
+        }
+
+
+def log_decision(log_path: str, request: str, decision: str) -> None:
+    """Append an LLM routing decision to the training log."""
+    with open(log_path, "a", encoding="utf-8") as f:
+        f.write(json.dumps({"request": request, "decision": decision}) + "\n")
@@ -1,12 +1,13 @@
-import uuid
+import asyncio
 from typing import Dict, Any, Optional
 import os
 from google.adk.agents import Agent
 from google.adk.runners import InMemoryRunner
 from google.adk.tools import FunctionTool
-from google.genai import types
 from google.adk.events import Event
 from dotenv import load_dotenv
+from routing_cache import NearDuplicateRoutingCache
+from runner_service import RunnerService, final_response_text
 
 
 # Load environment variables from .env file
@@ -63,43 +64,42 @@ coordinator = Agent(
     description="A specialized agent that coordinates requests and delegates them to the appropriate sub-agent."
 )
 
-async def run_coordinator(runner: InMemoryRunner, request: str):
-    user_id = "user234"
-    session_id = str(uuid.uuid4())
-    await runner.session_service.create_session(
-        app_name=runner.app_name, user_id=user_id, session_id=session_id
-    )
-
-    events = runner.run(
-        user_id=user_id,
-        session_id=session_id,
-        new_message=types.Content(
-            role='user',
-            parts=[types.Part(text=request)]
-        ),
-    )
-
-    for event in events:
-        if event.is_final_response() and event.content:
-            # Try to get text from event.content.text or from parts
-            if getattr(event.content, 'text', None):
-                return event.content.text
-            text_parts = [part.text for part in getattr(event.content, 'parts', []) if getattr(part, 'text', None)]
-            if text_parts:
-                return " ".join(text_parts)
-    return "No response received."
-    
+# Long-lived services for the coordinator and the specialists. The specialist
+# services are used when a near-duplicate request was already routed so the
+# coordinator's delegation call can be skipped.
+coordinator_service = RunnerService(InMemoryRunner(coordinator), max_concurrency=32, pool_size=8)
+specialist_services = {
+    agent.name: RunnerService(InMemoryRunner(agent), max_concurrency=32, pool_size=4)
+    for agent in (booking_agent, info_agent)
+}
+
+# Maps requests (and their paraphrases) to the name of the agent that handled them.
+routing_cache = NearDuplicateRoutingCache(max_entries=10_000, similarity_threshold=0.7)
+
+async def run_coordinator(request: str) -> str:
+    service = specialist_services.get(routing_cache.get(request), coordinator_service)
+    event = await service.run(request)
+    if event is not None and event.author in specialist_services:
+        routing_cache.put(request, event.author)
+    return final_response_text(event)
+
 async def main():
-    runner = InMemoryRunner(coordinator)
-    request = "I want to taste idly"
-    response = await run_coordinator(runner, request)
+    services = [coordinator_service, *specialist_services.values()]
+    await asyncio.gather(*(service.start() for service in services))
+
+    # Concurrent requests share one runner without blocking the event loop.
+    requests = ["I want to taste idly", "Book me a hotel in Chennai"]
+    responses = await asyncio.gather(*(run_coordinator(request) for request in requests))
+    for request, response in zip(requests, responses):
+        print(f"Request: {request}\nResponse: {response}")
+
+    # A paraphrase of an earlier request goes straight to the cached specialist.
+    response = await run_coordinator("book a hotel in chennai pls")
     print(f"Response: {response}")
+    print(f"Routing cache stats: {routing_cache.stats()}")
+    print(f"Coordinator service metrics: {coordinator_service.metrics()}")
 
-    if hasattr(runner, "shutdown"):
-        await runner.shutdown()
-    elif hasattr(runner, "close"):
-        await runner.close()
+    await asyncio.gather(*(service.close() for service in services))
 
 if __name__ == "__main__":
-    import asyncio
-    asyncio.run(main())
\ No newline at end of file
+    asyncio.run(main())
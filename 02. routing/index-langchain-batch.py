@@ -0,0 +1,172 @@
+import os
+import asyncio
+from typing import List, Literal, Optional, Set
+from pydantic import BaseModel, Field
+from langchain_google_genai import ChatGoogleGenerativeAI
+from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.runnables import RunnablePassthrough, RunnableBranch
+from dotenv import load_dotenv
+
+# Load environment variables from .env file
+load_dotenv()
+
+llm = ChatGoogleGenerativeAI(model="gemini-2.5-flash", api_key=os.getenv("GEMINI_API_KEY"))
+
+# Define simulated sub agent handlers
+def booking_handler(request: str) -> str:
+    """Simulates the Booking Agent handling a request."""
+    print("\n--- DELEGATING TO BOOKING HANDLER ---")
+    return f"Booking Handler processed request: '{request}'. Result:Simulated booking action."
+
+def info_handler(request: str) -> str:
+    """Simulates the Info Agent handling a request."""
+    print("\n--- DELEGATING TO INFO HANDLER ---")
+    return f"Info Handler processed request: '{request}'. Result:Simulated info action."
+
+def unclear_handler(request: str) -> str:
+    """Simulates the Unclear Agent handling a request."""
+    print("\n--- DELEGATING TO UNCLEAR HANDLER ---")
+    return f"Coordinator could not delegate request: '{request}'. Please clarify"
+
+# Structured output for classifying several requests in one call
+class RoutedRequest(BaseModel):
+    index: int = Field(description="The number of the request in the list")
+    decision: Literal["booker", "info", "unclear"]
+
+class BatchRoutingDecisions(BaseModel):
+    decisions: List[RoutedRequest]
+
+batch_router_prompt = ChatPromptTemplate.from_messages([
+    ("system", """Analyze each numbered user request and determine which specialized agent should process it.
+    - If the request is related to booking flights or hotels, the decision is 'booker'.
+    - For all other general information questions, the decision is 'info'.
+    - If the request is unclear or doesn't fit either category, the decision is 'unclear'.
+    Return exactly one decision for every request, using the request's number as its index."""),
+    ("user", "{requests}")
+])
+
+batch_router_chain = batch_router_prompt | llm.with_structured_output(BatchRoutingDecisions)
+
+branches = {
+    "booker": RunnablePassthrough.assign(output=lambda x:booking_handler(x['request']['request'])),
+    "info": RunnablePassthrough.assign(output=lambda x:info_handler(x['request']['request'])),
+    "unclear": RunnablePassthrough.assign(output=lambda x:unclear_handler(x['request']['request'])),
+}
+
+delegation_branch = RunnableBranch(
+    (lambda x: x['decision'].strip() == 'booker', branches['booker']),
+    (lambda x: x['decision'].strip() == 'info', branches['info']),
+    branches['unclear']
+)
+
+
+class MicroBatchRouter:
+    """Collects concurrent routing requests and classifies them in one LLM call.
+
+    A batch is sent when ``max_batch_size`` requests are waiting or
+    ``max_wait_seconds`` after the first request of the batch arrived,
+    whichever comes first. Each caller gets its own decision back, "unclear"
+    if the model skipped its request, or the error of its batch if the call
+    failed or its result could not be parsed. ``close`` waits for
+    the batches still in flight.
+    """
+
+    def __init__(self, max_batch_size: int = 16, max_wait_seconds: float = 0.05):
+        self.max_batch_size = max_batch_size
+        self.max_wait_seconds = max_wait_seconds
+        self.queue: Optional[asyncio.Queue] = None
+        self.collector: Optional[asyncio.Task] = None
+        self.dispatches: Set[asyncio.Task] = set()
+        self.requests = 0
+        self.llm_calls = 0
+
+    async def route(self, request: str) -> str:
+        if self.collector is None:
+            self.queue = asyncio.Queue()
+            self.collector = asyncio.create_task(self._collect())
+        future = asyncio.get_running_loop().create_future()
+        self.requests += 1
+        await self.queue.put((request, future))
+        return await future
+
+    async def _collect(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            deadline = loop.time() + self.max_wait_seconds
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            task = asyncio.create_task(self._dispatch(batch))
+            self.dispatches.add(task)
+            task.add_done_callback(self.dispatches.discard)
+
+    async def _dispatch(self, batch: list):
+        numbered = "\n".join(f"{i}. {request}" for i, (request, _) in enumerate(batch))
+        self.llm_calls += 1
+        try:
+            result = await batch_router_chain.ainvoke({"requests": numbered})
+            if result is None:
+                raise ValueError("Router returned no structured output.")
+            decisions = {item.index: item.decision for item in result.decisions}
+            for i, (_, future) in enumerate(batch):
+                if not future.done():
+                    # A request the model skipped is treated as unclear.
+                    future.set_result(decisions.get(i, "unclear"))
+        except Exception as e:
+            # No caller may be left waiting on a batch that failed.
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+        finally:
+            # Only reached with pending futures if the dispatch itself was cancelled.
+            for _, future in batch:
+                if not future.done():
+                    future.cancel()
+
+    async def close(self):
+        if self.collector is not None:
+            self.collector.cancel()
+            self.collector = None
+        if self.dispatches:
+            await asyncio.gather(*self.dispatches, return_exceptions=True)
+
+    def stats(self) -> dict:
+        return {
+            "requests": self.requests,
+            "llm_calls": self.llm_calls,
+            "avg_batch_size": self.requests / self.llm_calls if self.llm_calls else 0.0,
+        }
+
+
+router = MicroBatchRouter(max_batch_size=16, max_wait_seconds=0.05)
+
+async def coordinator_agent(request: str) -> str:
+    decision = await router.route(request)
+    result = await delegation_branch.ainvoke({"decision": decision, "request": {"request": request}})
+    return result['output']
+
+
+async def main():
+    requests = [
+        "Book me a flight to London.",
+        "What is the capital of Italy?",
+        "Tell me about quantum physics.",
+        "Reserve a hotel room in Tokyo.",
+        "How tall is Mount Everest?",
+    ]
+    # Requests arriving together share a single router call.
+    results = await asyncio.gather(*(coordinator_agent(request) for request in requests))
+    for request, result in zip(requests, results):
+        print(f"\nRequest: {request}\nFinal Result: {result}")
+
+    print(f"\nRouter stats: {router.stats()}")
+    await router.close()
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,163 @@
+import os
+import time
+import asyncio
+from collections import Counter, deque
+from langchain_google_genai import ChatGoogleGenerativeAI
+from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.output_parsers import StrOutputParser
+from langchain_core.runnables import RunnablePassthrough
+from dotenv import load_dotenv
+
+# Load environment variables from .env file
+load_dotenv()
+
+llm = ChatGoogleGenerativeAI(model="gemini-2.5-flash", api_key=os.getenv("GEMINI_API_KEY"))
+
+# Define simulated sub agent handlers
+def booking_handler(request: str) -> str:
+    """Simulates the Booking Agent handling a request."""
+    print("\n--- DELEGATING TO BOOKING HANDLER ---")
+    return f"Booking Handler processed request: '{request}'. Result:Simulated booking action."
+
+def info_handler(request: str) -> str:
+    """Simulates the Info Agent handling a request."""
+    print("\n--- DELEGATING TO INFO HANDLER ---")
+    return f"Info Handler processed request: '{request}'. Result:Simulated info action."
+
+def unclear_handler(request: str) -> str:
+    """Simulates the Unclear Agent handling a request."""
+    print("\n--- DELEGATING TO UNCLEAR HANDLER ---")
+    return f"Coordinator could not delegate request: '{request}'. Please clarify"
+
+# Define coordinator router chain
+coordinator_router_prompt = ChatPromptTemplate.from_messages([
+    ("system", """Analyze the user's request and determine which specialized agent should process it.
+    - If the request is related to booking flights or hotels, output 'booker'.
+    - For all other general information questions, output 'info'.
+    - If the request is unclear or doesn't fit either category, output 'unclear'.
+    ONLY output one word: "booker", "info", or "unclear"."""),
+    ("user", "{request}")
+])
+
+coordinator_router_chain = coordinator_router_prompt | llm | StrOutputParser()
+
+branches = {
+    "booker": RunnablePassthrough.assign(output=lambda x:booking_handler(x['request']['request'])),
+    "info": RunnablePassthrough.assign(output=lambda x:info_handler(x['request']['request'])),
+    "unclear": RunnablePassthrough.assign(output=lambda x:unclear_handler(x['request']['request'])),
+}
+
+
+class TrafficPriors:
+    """Keeps the most recent routing decisions to guess the next one."""
+
+    def __init__(self, window: int = 100, default: str = "info"):
+        self.recent = deque(maxlen=window)
+        self.default = default
+
+    def most_likely(self) -> str:
+        if not self.recent:
+            return self.default
+        return Counter(self.recent).most_common(1)[0][0]
+
+    def record(self, decision: str) -> None:
+        self.recent.append(decision)
+
+
+class SpeculationStats:
+    """Accumulates how often speculation paid off and what it cost."""
+
+    def __init__(self):
+        self.requests = 0
+        self.speculated = 0
+        self.hits = 0
+        self.latency_saved = 0.0
+        self.wasted_work = 0.0
+
+    def report(self) -> dict:
+        return {
+            "requests": self.requests,
+            "speculated": self.speculated,
+            "speculation_hits": self.hits,
+            "hit_rate": self.hits / self.speculated if self.speculated else 0.0,
+            "latency_saved_seconds": round(self.latency_saved, 4),
+            "wasted_handler_seconds": round(self.wasted_work, 4),
+        }
+
+
+# Handlers that only read, so running one for a wrong guess does no harm.
+# The booker makes reservations and is never started speculatively.
+SPECULATION_SAFE_HANDLERS = {"info", "unclear"}
+
+priors = TrafficPriors()
+speculation_stats = SpeculationStats()
+
+
+async def timed_branch(decision: str, request: str) -> tuple:
+    """Run a delegation branch and return its output with the time it took."""
+    started = time.perf_counter()
+    result = await branches[decision].ainvoke({"decision": decision, "request": {"request": request}})
+    return result['output'], time.perf_counter() - started
+
+
+async def speculative_coordinator(request: str) -> str:
+    """Runs the router and the most likely handler at the same time.
+
+    Only side-effect-free handlers are started speculatively, since a handler
+    running in a worker thread cannot be interrupted. If the router picks the
+    speculated handler its result is used directly; otherwise, or if the
+    router fails, the speculative work is cancelled (or discarded if it
+    already finished) and the chosen handler runs as usual.
+    """
+    guess = priors.most_likely()
+    speculation_stats.requests += 1
+    speculative_task = None
+    if guess in SPECULATION_SAFE_HANDLERS:
+        speculative_task = asyncio.create_task(timed_branch(guess, request))
+        speculation_stats.speculated += 1
+
+    router_started = time.perf_counter()
+    decision = None
+    try:
+        decision = (await coordinator_router_chain.ainvoke({"request": request})).strip()
+        router_time = time.perf_counter() - router_started
+        if decision not in branches:
+            decision = "unclear"
+        priors.record(decision)
+
+        if speculative_task is not None and decision == guess:
+            output, handler_time = await speculative_task
+            speculation_stats.hits += 1
+            # Serially this would have cost router_time + handler_time; only a correct guess saves time.
+            speculation_stats.latency_saved += min(router_time, handler_time)
+            return output
+    finally:
+        # Wrong guess or failed router: the speculative work is wasted.
+        if speculative_task is not None and decision != guess:
+            if not speculative_task.done():
+                speculative_task.cancel()
+                speculation_stats.wasted_work += time.perf_counter() - router_started
+            elif not speculative_task.cancelled() and speculative_task.exception() is None:
+                speculation_stats.wasted_work += speculative_task.result()[1]
+
+    output, _ = await timed_branch(decision, request)
+    return output
+
+
+async def main():
+    requests = [
+        "Book me a flight to London.",
+        "What is the capital of Italy?",
+        "Reserve a hotel in Paris for two nights.",
+        "Book a flight to Rome.",
+        "Tell me about quantum physics.",
+    ]
+    for request in requests:
+        print(f"\n--- Running: {request} ---")
+        result = await speculative_coordinator(request)
+        print(f"Final Result: {result}")
+
+    print(f"\nSpeculation stats: {speculation_stats.report()}")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,10 +1,14 @@
 import os
+import random
+from concurrent.futures import ThreadPoolExecutor
 from httpcore import request
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
-from langchain_core.runnables import RunnablePassthrough, RunnableBranch
+from langchain_core.runnables import RunnablePassthrough, RunnableBranch, RunnableLambda
 from dotenv import load_dotenv
+from fast_router import FastPathClassifier, log_decision
+from routing_cache import NearDuplicateRoutingCache
 
 # Load environment variables from .env file
 load_dotenv()
@@ -40,6 +44,38 @@ coordinator_router_prompt = ChatPromptTemplate.from_messages([
 
 coordinator_router_chain = coordinator_router_prompt | llm | StrOutputParser()
 
+# Local fast path in front of the LLM router.
+# High-confidence requests are routed by keyword rules or a hashed-feature
+# linear model trained on earlier LLM decisions; the rest fall through to the LLM.
+DECISION_LOG = "routing_decisions.jsonl"
+SHADOW_RATE = 0.1  # Fraction of fast-path decisions also checked against the LLM
+
+fast_path = FastPathClassifier(confidence_threshold=0.9)
+fast_path.fit_from_log(DECISION_LOG)
+# Shadow checks run here so they add no latency to the request being routed.
+shadow_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="shadow-router")
+
+def shadow_check(x: dict, fast_decision: str) -> None:
+    fast_path.record_comparison(fast_decision, coordinator_router_chain.invoke(x).strip())
+
+# Paraphrased requests reuse an earlier decision instead of being routed again.
+routing_cache = NearDuplicateRoutingCache(max_entries=10_000, similarity_threshold=0.7)
+
+def route_decision(x: dict) -> str:
+    """Returns a cached or fast-path decision when available, otherwise asks the LLM router."""
+    decision = routing_cache.get(x['request'])
+    if decision is not None:
+        return decision
+    decision = fast_path.classify(x['request'])
+    if decision is not None:
+        if random.random() < SHADOW_RATE:
+            shadow_pool.submit(shadow_check, x, decision)
+    else:
+        decision = coordinator_router_chain.invoke(x).strip()
+        log_decision(DECISION_LOG, x['request'], decision)
+    routing_cache.put(x['request'], decision)
+    return decision
+
 # Define the delegation logic
 # Use runnable to route based on the router chain's output.
 # Define the branches for the runnable branch.
@@ -63,7 +99,7 @@ delegation_branch = RunnableBranch(
 # The router chain's output is passed along with the original input to the delegation branch.
 
 coordinator_agent = {
-    "decision": coordinator_router_chain,
+    "decision": RunnableLambda(route_decision),
     "request": RunnablePassthrough()
 } | delegation_branch | (lambda x: x['output'])
 
@@ -79,4 +115,12 @@ print(f"Final Result B: {result_b}")
 print("\n--- Running with an unclear request ---")
 request_c = "Tell me about quantum physics."
 result_c = coordinator_agent.invoke({"request": request_c})
-print(f"Final Result C: {result_c}")
\ No newline at end of file
+print(f"Final Result C: {result_c}")
+print("\n--- Running with a paraphrased booking request ---")
+request_d = "book a flight to london pls"
+result_d = coordinator_agent.invoke({"request": request_d})
+print(f"Final Result D: {result_d}")
+
+shadow_pool.shutdown(wait=True)
+print(f"\nFast path stats: {fast_path.stats()}")
+print(f"Routing cache stats: {routing_cache.stats()}")
@@ -0,0 +1,156 @@
+"""
+Routing Cache - Near-duplicate aware cache of routing decisions using MinHash signatures
+"""
+
+import random
+import re
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Dict, List, Optional, Set, Tuple
+
+# Words that do not change where a request should be routed.
+FILLER_WORDS = {"please", "pls", "plz", "kindly", "me", "can", "could", "you", "i", "want", "to", "the", "a", "an"}
+# Words that flip a request's meaning; they are always kept, and a near-duplicate
+# hit is only allowed between requests with the same negations.
+NEGATION_WORDS = {"not", "no", "never", "nor", "neither", "none", "nothing", "without"}
+# Irregular contractions; every other "n't" becomes " not".
+_CONTRACTIONS = {"can't": "can not", "won't": "will not", "shan't": "shall not", "ain't": "is not"}
+
+_MERSENNE_PRIME = (1 << 61) - 1
+
+
+def normalize_request(request: str) -> str:
+    """Lower-case, expand negated contractions, strip punctuation and filler words, and collapse whitespace."""
+    text = request.lower().replace("\u2019", "'")
+    text = re.sub(r"\b(?:can|won|shan|ain)'t\b", lambda m: _CONTRACTIONS[m.group(0)], text)
+    text = re.sub(r"n't\b", " not", text)
+    words = re.findall(r"[a-z0-9]+", text)
+    kept = [word for word in words if word not in FILLER_WORDS]
+    return " ".join(kept or words)
+
+
+def negations(normalized: str) -> List[str]:
+    """The negation words of a normalized request, in order."""
+    return [word for word in normalized.split() if word in NEGATION_WORDS]
+
+
+def shingles(text: str, k: int = 3) -> Set[int]:
+    """Hash the character k-grams of the text."""
+    if len(text) <= k:
+        return {zlib.crc32(text.encode("utf-8"))}
+    return {zlib.crc32(text[i:i + k].encode("utf-8")) for i in range(len(text) - k + 1)}
+
+
+class NearDuplicateRoutingCache:
+    """LRU cache of routing decisions that also matches paraphrased requests.
+
+    Each request is normalized and turned into a MinHash signature. Signatures
+    are split into LSH bands so a lookup only compares against candidates that
+    share at least one band; a candidate is a hit when its estimated Jaccard
+    similarity is at least ``similarity_threshold`` and it has the same
+    negations, so "Don't book a flight" never reuses the decision for "Book a
+    flight".
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 10_000,
+        similarity_threshold: float = 0.7,
+        num_perm: int = 64,
+        bands: int = 16,
+        seed: int = 1,
+    ):
+        if num_perm % bands != 0:
+            raise ValueError("num_perm must be divisible by bands")
+        self.max_entries = max_entries
+        self.similarity_threshold = similarity_threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        rng = random.Random(seed)
+        self._perms = [
+            (rng.randrange(1, _MERSENNE_PRIME), rng.randrange(0, _MERSENNE_PRIME))
+            for _ in range(num_perm)
+        ]
+        self._entries: "OrderedDict[str, Tuple[List[int], str]]" = OrderedDict()
+        self._buckets: List[Dict[Tuple[int, ...], Set[str]]] = [{} for _ in range(bands)]
+        self._lock = threading.Lock()
+        self.lookups = 0
+        self.exact_hits = 0
+        self.near_hits = 0
+        self.evictions = 0
+
+    def _signature(self, normalized: str) -> List[int]:
+        hashed = shingles(normalized)
+        return [min((a * h + b) % _MERSENNE_PRIME for h in hashed) for a, b in self._perms]
+
+    def _band_keys(self, signature: List[int]) -> List[Tuple[int, ...]]:
+        return [tuple(signature[i * self.rows:(i + 1) * self.rows]) for i in range(self.bands)]
+
+    def get(self, request: str) -> Optional[str]:
+        """Return the cached decision for the request or a near-duplicate of it."""
+        normalized = normalize_request(request)
+        with self._lock:
+            self.lookups += 1
+            entry = self._entries.get(normalized)
+            if entry is not None:
+                self._entries.move_to_end(normalized)
+                self.exact_hits += 1
+                return entry[1]
+
+            signature = self._signature(normalized)
+            candidates: Set[str] = set()
+            for band, key in enumerate(self._band_keys(signature)):
+                candidates.update(self._buckets[band].get(key, ()))
+
+            best_key, best_similarity = None, 0.0
+            request_negations = negations(normalized)
+            for candidate in candidates:
+                if negations(candidate) != request_negations:
+                    continue
+                candidate_signature = self._entries[candidate][0]
+                similarity = sum(x == y for x, y in zip(signature, candidate_signature)) / self.num_perm
+                if similarity > best_similarity:
+                    best_key, best_similarity = candidate, similarity
+            if best_key is None or best_similarity < self.similarity_threshold:
+                return None
+            self._entries.move_to_end(best_key)
+            self.near_hits += 1
+            return self._entries[best_key][1]
+
+    def put(self, request: str, decision: str) -> None:
+        """Store the routing decision for the request, evicting the least recently used entries."""
+        normalized = normalize_request(request)
+        with self._lock:
+            if normalized in self._entries:
+                self._entries[normalized] = (self._entries[normalized][0], decision)
+                self._entries.move_to_end(normalized)
+                return
+            signature = self._signature(normalized)
+            self._entries[normalized] = (signature, decision)
+            for band, key in enumerate(self._band_keys(signature)):
+                self._buckets[band].setdefault(key, set()).add(normalized)
+            while len(self._entries) > self.max_entries:
+                self._evict_oldest()
+
+    def _evict_oldest(self) -> None:
+        normalized, (signature, _) = self._entries.popitem(last=False)
+        for band, key in enumerate(self._band_keys(signature)):
+            bucket = self._buckets[band].get(key)
+            if bucket is not None:
+                bucket.discard(normalized)
+                if not bucket:
+                    del self._buckets[band][key]
+        self.evictions += 1
+
+    def stats(self) -> Dict[str, float]:
+        hits = self.exact_hits + self.near_hits
+        return {
+            "lookups": self.lookups,
+            "exact_hits": self.exact_hits,
+            "near_duplicate_hits": self.near_hits,
+            "hit_rate": hits / self.lookups if self.lookups else 0.0,
+            "entries": len(self._entries),
+            "evictions": self.evictions,
+        }
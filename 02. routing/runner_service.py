@@ -0,0 +1,144 @@
+"""
+Runner Service - Long-lived async wrapper around an ADK runner with a pre-warmed session pool
+"""
+
+import asyncio
+import time
+import uuid
+from typing import Optional
+
+from google.adk.events import Event
+from google.adk.runners import Runner
+from google.genai import types
+
+
+def final_response_text(event: Optional[Event]) -> str:
+    """Extract the text of a final response event."""
+    if event is None or not event.content:
+        return "No response received."
+    # Try to get text from event.content.text or from parts
+    if getattr(event.content, 'text', None):
+        return event.content.text
+    text_parts = [part.text for part in getattr(event.content, 'parts', None) or [] if getattr(part, 'text', None)]
+    if text_parts:
+        return " ".join(text_parts)
+    return "No response received."
+
+
+class RunnerService:
+    """Serves many concurrent requests on one runner without blocking the event loop.
+
+    Requests run through ``runner.run_async``. Each request gets a fresh
+    session taken from a pool that is created ahead of time and refilled in
+    the background, so session creation is off the request path. At most
+    ``max_concurrency`` requests run at once; the rest wait in a queue, and
+    both are reported by ``metrics()``.
+    """
+
+    def __init__(self, runner: Runner, user_id: str = "user234", max_concurrency: int = 32, pool_size: int = 8):
+        self.runner = runner
+        self.user_id = user_id
+        self.max_concurrency = max_concurrency
+        self.pool_size = pool_size
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._sessions: asyncio.Queue = asyncio.Queue()
+        self._refill_tasks = set()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.queued = 0
+        self.max_queued = 0
+        self.completed = 0
+        self.failed = 0
+        self.total_queue_wait = 0.0
+        self.total_latency = 0.0
+
+    async def _create_session(self) -> str:
+        session_id = str(uuid.uuid4())
+        await self.runner.session_service.create_session(
+            app_name=self.runner.app_name, user_id=self.user_id, session_id=session_id
+        )
+        return session_id
+
+    async def _refill(self) -> None:
+        await self._sessions.put(await self._create_session())
+
+    async def start(self) -> "RunnerService":
+        """Pre-warm the session pool."""
+        session_ids = await asyncio.gather(*(self._create_session() for _ in range(self.pool_size)))
+        for session_id in session_ids:
+            self._sessions.put_nowait(session_id)
+        return self
+
+    async def _acquire_session(self) -> str:
+        if self._sessions.empty():
+            return await self._create_session()
+        session_id = self._sessions.get_nowait()
+        task = asyncio.create_task(self._refill())
+        self._refill_tasks.add(task)
+        task.add_done_callback(self._refill_tasks.discard)
+        return session_id
+
+    async def run(self, request: str) -> Optional[Event]:
+        """Send a request on a fresh session and return its final response event."""
+        enqueued_at = time.perf_counter()
+        if self._semaphore.locked():
+            # Only requests that actually wait for a slot count as queued.
+            self.queued += 1
+            self.max_queued = max(self.max_queued, self.queued)
+            try:
+                await self._semaphore.acquire()
+            finally:
+                self.queued -= 1
+        else:
+            await self._semaphore.acquire()
+        started = time.perf_counter()
+        self.total_queue_wait += started - enqueued_at
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        session_id = None
+        try:
+            session_id = await self._acquire_session()
+            final_event = None
+            async for event in self.runner.run_async(
+                user_id=self.user_id,
+                session_id=session_id,
+                new_message=types.Content(role='user', parts=[types.Part(text=request)]),
+            ):
+                if final_event is None and event.is_final_response() and event.content:
+                    final_event = event
+            self.completed += 1
+            return final_event
+        except Exception:
+            self.failed += 1
+            raise
+        finally:
+            if session_id is not None:
+                # Sessions are single-use so requests never share history, including failed ones.
+                await self.runner.session_service.delete_session(
+                    app_name=self.runner.app_name, user_id=self.user_id, session_id=session_id
+                )
+            self.in_flight -= 1
+            self.total_latency += time.perf_counter() - started
+            self._semaphore.release()
+
+    def metrics(self) -> dict:
+        finished = self.completed + self.failed
+        return {
+            "in_flight": self.in_flight,
+            "max_in_flight": self.max_in_flight,
+            "queued": self.queued,
+            "max_queued": self.max_queued,
+            "completed": self.completed,
+            "failed": self.failed,
+            "avg_queue_wait_seconds": self.total_queue_wait / finished if finished else 0.0,
+            "avg_run_seconds": self.total_latency / finished if finished else 0.0,
+            "idle_sessions": self._sessions.qsize(),
+        }
+
+    async def close(self) -> None:
+        for task in list(self._refill_tasks):
+            task.cancel()
+        if hasattr(self.runner, "shutdown"):
+            await self.runner.shutdown()
+        elif hasattr(self.runner, "close"):
+            await self.runner.close()
@@ -1,6 +1,13 @@
 import uuid
 import os
+import time
+import asyncio
+from contextlib import aclosing
+from typing import AsyncGenerator, Dict, Optional, Tuple
 from google.adk.agents import LlmAgent, ParallelAgent, SequentialAgent
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event, EventActions
 from google.adk.tools import google_search
 from google.adk.runners import InMemoryRunner
 from google.genai import types
@@ -9,6 +16,158 @@ from dotenv import load_dotenv
 load_dotenv()
 GEMINI_MODEL = "gemini-2.0-flash"
 
+# --- Research result cache ---
+# google_search runs on the model side, so there is no local tool call to
+# intercept. Instead each researcher's summary is cached by its search query
+# and reused through before_agent_callback, which skips the agent (and its
+# search) entirely on a hit.
+
+class ResearchCache:
+    """In-memory TTL cache of researcher summaries keyed by search query."""
+
+    def __init__(self, ttl_seconds: float = 3600, max_entries: int = 1000):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.entries: Dict[str, Tuple[float, str]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, query: str) -> Optional[str]:
+        entry = self.entries.get(query.lower())
+        if entry is None or time.time() - entry[0] > self.ttl_seconds:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry[1]
+
+    def put(self, query: str, summary: str) -> None:
+        if len(self.entries) >= self.max_entries:
+            # Drop the oldest entry.
+            del self.entries[min(self.entries, key=lambda k: self.entries[k][0])]
+        self.entries[query.lower()] = (time.time(), summary)
+
+RESEARCH_FALLBACK_TEXT = "No findings available: the researcher did not finish in time."
+
+research_cache = ResearchCache()
+
+def serve_cached_research(query: str, output_key: str):
+    """before_agent_callback that answers from the cache, skipping the researcher."""
+    def callback(callback_context: CallbackContext) -> Optional[types.Content]:
+        summary = research_cache.get(query)
+        if summary is None:
+            return None
+        callback_context.state[output_key] = summary
+        return types.Content(role="model", parts=[types.Part(text=summary)])
+    return callback
+
+def store_research(query: str, output_key: str):
+    """after_agent_callback that caches the researcher's summary."""
+    def callback(callback_context: CallbackContext) -> Optional[types.Content]:
+        summary = callback_context.state.get(output_key)
+        if summary and summary != RESEARCH_FALLBACK_TEXT:
+            research_cache.put(query, summary)
+        return None
+    return callback
+
+# --- Bounded parallel agent ---
+
+class BoundedParallelAgent(ParallelAgent):
+    """ParallelAgent that limits how many sub-agents run at once and how long each may take.
+
+    A sub-agent that misses its deadline is stopped and a fallback value is
+    written to its ``output_key``, so downstream agents still find the key.
+    Only public ADK APIs are used: each sub-agent runs on its own branch of a
+    copied context, and the events of all branches are merged through one queue.
+    """
+
+    max_concurrency: int = 2
+    timeout_seconds: float = 60.0
+    fallback_text: str = RESEARCH_FALLBACK_TEXT
+
+    def _branch_ctx(self, sub_agent, ctx: InvocationContext) -> InvocationContext:
+        """A copy of the context on a branch of its own, so sub-agents do not see each other's events."""
+        suffix = f"{self.name}.{sub_agent.name}"
+        return ctx.model_copy(update={"branch": f"{ctx.branch}.{suffix}" if ctx.branch else suffix})
+
+    async def _run_bounded(
+        self, sub_agent, ctx: InvocationContext, semaphore: asyncio.Semaphore
+    ) -> AsyncGenerator[Event, None]:
+        async with semaphore:
+            # The sub-agent runs in its own task so it can be cancelled at the
+            # deadline; each event is handed over and the sub-agent waits until
+            # it has been consumed, as ParallelAgent does.
+            queue: asyncio.Queue = asyncio.Queue()
+            finished = object()
+
+            async def run_sub_agent():
+                try:
+                    async for event in sub_agent.run_async(self._branch_ctx(sub_agent, ctx)):
+                        consumed = asyncio.Event()
+                        queue.put_nowait((event, consumed))
+                        await consumed.wait()
+                finally:
+                    queue.put_nowait((finished, None))
+
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + self.timeout_seconds
+            task = asyncio.create_task(run_sub_agent())
+            try:
+                while True:
+                    event, consumed = await asyncio.wait_for(queue.get(), max(0.0, deadline - loop.time()))
+                    if event is finished:
+                        await task  # Re-raise any error from the sub-agent.
+                        return
+                    yield event
+                    consumed.set()
+            except asyncio.TimeoutError:
+                pass
+            finally:
+                task.cancel()
+
+            output_key = getattr(sub_agent, "output_key", None)
+            yield Event(
+                invocation_id=ctx.invocation_id,
+                author=sub_agent.name,
+                content=types.Content(role="model", parts=[types.Part(text=self.fallback_text)]),
+                actions=EventActions(state_delta={output_key: self.fallback_text} if output_key else {}),
+            )
+
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        merged: asyncio.Queue = asyncio.Queue()
+        finished = object()
+
+        async def forward(sub_agent):
+            """Feed one bounded branch into the merged queue, one consumed event at a time."""
+            try:
+                async with aclosing(self._run_bounded(sub_agent, ctx, semaphore)) as events:
+                    async for event in events:
+                        consumed = asyncio.Event()
+                        merged.put_nowait((event, consumed))
+                        await consumed.wait()
+            except Exception as e:
+                merged.put_nowait((finished, e))
+            else:
+                merged.put_nowait((finished, None))
+
+        tasks = [asyncio.create_task(forward(sub_agent)) for sub_agent in self.sub_agents]
+        try:
+            running = len(tasks)
+            while running:
+                event, payload = await merged.get()
+                if event is finished:
+                    running -= 1
+                    if payload is not None:
+                        raise payload
+                    continue
+                yield event
+                payload.set()
+        finally:
+            # On an error or early exit, stop the branches that are still running.
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
 # Define researcher sub agent (to run in parallel)
 # Reasercher 1: Renewable Energy
 
@@ -22,7 +181,9 @@ researcher_agent_1 = LlmAgent(
           Output *only* the summary""",
     tools=[google_search],
     description="This agent specializes in renewable energy research.",
-    output_key="renewable_energy_result"
+    output_key="renewable_energy_result",
+    before_agent_callback=serve_cached_research("renewable energy sources", "renewable_energy_result"),
+    after_agent_callback=store_research("renewable energy sources", "renewable_energy_result"),
 )
 
 # Researcher 2: Electric Vehicles
@@ -37,7 +198,9 @@ researcher_agent_2 = LlmAgent(
           Output *only* the summary""",
     tools=[google_search],
     description="This agent specializes in electric vehicles research.",
-    output_key="ev_technology_result"
+    output_key="ev_technology_result",
+    before_agent_callback=serve_cached_research("electric vehicles technology", "ev_technology_result"),
+    after_agent_callback=store_research("electric vehicles technology", "ev_technology_result"),
 )
 
 # Researcher 3: Carbon Capture
@@ -52,14 +215,18 @@ researcher_agent_3 = LlmAgent(
           Output *only* the summary""",
     tools=[google_search],
     description="This agent specializes in carbon capture research.",
-    output_key="carbon_capture_result"
+    output_key="carbon_capture_result",
+    before_agent_callback=serve_cached_research("carbon capture methods", "carbon_capture_result"),
+    after_agent_callback=store_research("carbon capture methods", "carbon_capture_result"),
 )
 
 # Create the parallel agent to run all researchers in parallel
-parallel_researcher_agent = ParallelAgent(
+parallel_researcher_agent = BoundedParallelAgent(
     name="ParallelWebResearcherAgent",
     sub_agents=[researcher_agent_1, researcher_agent_2, researcher_agent_3],
-    description="This agent runs multiple researchers in parallel."
+    description="This agent runs multiple researchers in parallel.",
+    max_concurrency=2,
+    timeout_seconds=60.0,
 )
 
 # Define the merger agent
@@ -137,6 +304,7 @@ async def main():
   )
   for result in result_gen:
     print(result)
+  print(f"Research cache: hits={research_cache.hits} misses={research_cache.misses}")
 
 if __name__ == "__main__":
   asyncio.run(main())
@@ -1,11 +1,14 @@
 import os
+import time
 import asyncio
-from typing import Optional
+import statistics
+from collections import defaultdict
+from typing import Dict, List, Optional
 
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.output_parsers import StrOutputParser
-from langchain_core.runnables import RunnablePassthrough, RunnableParallel, Runnable
+from langchain_core.runnables import RunnablePassthrough, RunnableParallel, Runnable, RunnableLambda
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -40,13 +43,115 @@ terms_chain = Runnable = (
         ]
     )) | llm | StrOutputParser()
 
+# Global limit on LLM calls in flight across every topic and branch
+MAX_CONCURRENT_LLM_CALLS = 8
+llm_semaphore = asyncio.Semaphore(MAX_CONCURRENT_LLM_CALLS)
+
+# Per-branch deadline; a branch that misses it is replaced by MISSING_BRANCH_TEXT
+BRANCH_DEADLINE_SECONDS: Optional[float] = 30.0
+# Send a duplicate request once a call has been running longer than this
+# percentile of the branch's past latencies (None disables hedging)
+HEDGE_PERCENTILE: Optional[float] = 95
+MIN_HEDGE_SAMPLES = 5
+# Partial-synthesis policy: synthesize as long as this many branches finished
+MIN_COMPLETED_BRANCHES = 2
+MISSING_BRANCH_TEXT = "(not available: this branch did not finish in time)"
+
+# Latency of each branch call, in seconds, keyed by branch name
+branch_latencies: Dict[str, List[float]] = defaultdict(list)
+branch_hedges: Dict[str, int] = defaultdict(int)
+branch_timeouts: Dict[str, int] = defaultdict(int)
+
+def hedge_delay(name: str) -> Optional[float]:
+    """Return how long to wait before hedging a call to the branch, if at all."""
+    latencies = branch_latencies[name]
+    if HEDGE_PERCENTILE is None or len(latencies) < MIN_HEDGE_SAMPLES:
+        return None
+    ordered = sorted(latencies)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * HEDGE_PERCENTILE / 100))]
+
+async def hedged_call(name: str, chain: Runnable, value, deadline: Optional[float]):
+    """Call the chain, racing a duplicate request if the first one is a straggler.
+
+    The deadline and the hedge delay are measured from when the call gets a
+    slot under the global limit, not from when it started queueing for one.
+    """
+    slot_acquired = asyncio.Event()
+    tasks = set()
+
+    async def attempt():
+        async with llm_semaphore:
+            slot_acquired.set()
+            return await chain.ainvoke(value)
+
+    async def race():
+        delay = hedge_delay(name)
+        if delay is not None:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if not done:
+                branch_hedges[name] += 1
+                tasks.add(asyncio.create_task(attempt()))
+        pending, error = set(tasks), None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+                error = task.exception()
+        raise error
+
+    tasks.add(asyncio.create_task(attempt()))
+    try:
+        await slot_acquired.wait()
+        started = time.perf_counter()
+        result = await asyncio.wait_for(race(), deadline)
+        branch_latencies[name].append(time.perf_counter() - started)
+        return result
+    finally:
+        # The first answer wins; drop any request still running.
+        for task in tasks:
+            task.cancel()
+
+def timed(name: str, chain: Runnable, deadline: Optional[float] = None, fallback: Optional[str] = None) -> Runnable:
+    """Wrap a chain so its calls are rate limited, hedged and timed.
+
+    With a deadline, a call that does not finish in time returns ``fallback``
+    instead of holding up the rest of the pipeline.
+    """
+    def run(value):
+        started = time.perf_counter()
+        result = chain.invoke(value)
+        branch_latencies[name].append(time.perf_counter() - started)
+        return result
+
+    async def arun(value):
+        try:
+            return await hedged_call(name, chain, value, deadline)
+        except asyncio.TimeoutError:
+            if fallback is None:
+                raise
+            branch_timeouts[name] += 1
+            return fallback
+
+    return RunnableLambda(run, afunc=arun, name=name)
+
+def check_partial_results(results: dict) -> dict:
+    """Apply the partial-synthesis policy to the branch results."""
+    completed = sum(1 for key in ("summary", "questions", "key_terms") if results[key] != MISSING_BRANCH_TEXT)
+    if completed < MIN_COMPLETED_BRANCHES:
+        raise RuntimeError(
+            f"Only {completed} branches finished for '{results['topic']}', "
+            f"{MIN_COMPLETED_BRANCHES} are required for synthesis."
+        )
+    return results
+
 # Build the parallel chain
 
 map_chain = RunnableParallel(
     {
-        "summary": summarize_chain,
-        "questions": question_chain,
-        "key_terms": terms_chain,
+        "summary": timed("summary", summarize_chain, BRANCH_DEADLINE_SECONDS, MISSING_BRANCH_TEXT),
+        "questions": timed("questions", question_chain, BRANCH_DEADLINE_SECONDS, MISSING_BRANCH_TEXT),
+        "key_terms": timed("key_terms", terms_chain, BRANCH_DEADLINE_SECONDS, MISSING_BRANCH_TEXT),
         "topic": RunnablePassthrough(),
     }
 )
@@ -63,12 +168,33 @@ synthesis_prompt = ChatPromptTemplate.from_messages(
     ])
 
 # Construct full chain
-full_parallel_chain = map_chain | synthesis_prompt | llm | StrOutputParser()
+full_parallel_chain = (
+    map_chain
+    | RunnableLambda(check_partial_results)
+    | timed("synthesis", synthesis_prompt | llm | StrOutputParser())
+)
+
+def print_branch_latencies() -> None:
+    print("\n--- Branch latency (seconds) ---")
+    for name, latencies in branch_latencies.items():
+        summary = "calls=0"
+        if latencies:
+            summary = (
+                f"calls={len(latencies)} mean={statistics.mean(latencies):.3f} "
+                f"median={statistics.median(latencies):.3f} max={max(latencies):.3f}"
+            )
+        print(f"{name:>10}: {summary} hedged={branch_hedges[name]} timed_out={branch_timeouts[name]}")
 
-async def main(topic: str) -> None:
-    result = full_parallel_chain.invoke(topic)
-    print(result)
+async def main(topics: List[str]) -> None:
+    # All topics run at once; the semaphore bounds the LLM calls in flight.
+    results = await full_parallel_chain.abatch(topics, return_exceptions=True)
+    for topic, result in zip(topics, results):
+        print(f"\n=== {topic} ===\n{result}")
+    print_branch_latencies()
 
 if __name__ == "__main__":
-    import asyncio
-    asyncio.run(main("The history of space exploration"))
\ No newline at end of file
+    asyncio.run(main([
+        "The history of space exploration",
+        "The future of renewable energy",
+        "The impact of the printing press",
+    ]))
@@ -0,0 +1,186 @@
+"""
+Claim Cache - Persistent claim-to-verdict cache for claim-level fact checking
+"""
+
+import hashlib
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?;])\s+(?=[A-Z0-9\"'(])")
+# Abbreviations whose trailing period does not end a sentence.
+ABBREVIATIONS = {
+    "dr", "mr", "mrs", "ms", "prof", "st", "sr", "jr", "mt", "ft", "gen", "col", "lt", "sgt",
+    "capt", "rev", "hon", "vs", "e.g", "i.e", "approx", "ca", "fig", "no", "vol",
+}
+
+
+def _ends_with_abbreviation(piece: str) -> bool:
+    """True if ``piece`` ends with a title, a common abbreviation or a single initial such as ``W.``."""
+    if not piece.endswith("."):
+        return False
+    word = piece.split()[-1][:-1].lstrip("(\"'").lower()
+    return (len(word) == 1 and word.isalpha()) or word in ABBREVIATIONS
+
+
+def split_sentences(text: str) -> List[str]:
+    """Split text at sentence boundaries, keeping "Dr. W. G. Grace" in one sentence."""
+    sentences: List[str] = []
+    for piece in SENTENCE_BOUNDARY.split(text.strip()):
+        if sentences and _ends_with_abbreviation(sentences[-1]):
+            sentences[-1] += " " + piece
+        else:
+            sentences.append(piece)
+    return sentences
+
+
+def split_claims(text: str) -> List[str]:
+    """Split a paragraph into sentence-sized claims, dropping duplicates."""
+    claims = []
+    seen = set()
+    for claim in split_sentences(text):
+        claim = claim.strip().rstrip(";").strip()
+        key = normalize_claim(claim)
+        # Fragments of a few words are not checkable claims on their own.
+        if len(key.split()) < 3 or key in seen:
+            continue
+        seen.add(key)
+        claims.append(claim)
+    return claims
+
+
+def normalize_claim(claim: str) -> str:
+    """Canonical form of a claim: lower case, single spaces, no trailing punctuation."""
+    return re.sub(r"\s+", " ", claim.lower()).strip().rstrip(".!?;:,").strip()
+
+
+class ClaimVerdictCache:
+    """SQLite backed map from a normalized claim to its fact-check verdict.
+
+    Verdicts (``ACCURATE`` or ``INACCURATE`` plus the reasoning) are keyed by a
+    SHA-256 of the ``scope`` and the normalized claim text, so a claim checked
+    once is not sent to the LLM again, across drafts, loop iterations and
+    runs. The scope is the subject the claims were written about: a claim like
+    "It was first played by children." is only true or false in context, so
+    its verdict for one subject must not be reused for another. The least
+    recently used entries are evicted beyond ``max_entries``, and entries
+    older than ``ttl_seconds`` are treated as misses.
+    """
+
+    def __init__(
+        self,
+        database_path: str = "claim_cache.db",
+        max_entries: int = 50_000,
+        ttl_seconds: Optional[float] = None,
+    ):
+        self.database_path = database_path
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(database_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS claim_verdicts (
+                key TEXT PRIMARY KEY,
+                claim TEXT NOT NULL,
+                status TEXT NOT NULL,
+                reasoning TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )"""
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_claim_verdicts_last_access ON claim_verdicts (last_access)"
+        )
+        self._conn.commit()
+        self._size = self._conn.execute("SELECT COUNT(*) FROM claim_verdicts").fetchone()[0]
+
+    @staticmethod
+    def _key(scope: str, claim: str) -> str:
+        scoped = normalize_claim(scope) + "\x00" + normalize_claim(claim)
+        return hashlib.sha256(scoped.encode("utf-8")).hexdigest()
+
+    def lookup_many(self, claims: Iterable[str], scope: str = "") -> Dict[str, Tuple[str, str]]:
+        """Return ``{claim: (status, reasoning)}`` for the claims cached under ``scope``."""
+        claims = list(claims)
+        keys = {self._key(scope, claim): claim for claim in claims}
+        now = time.time()
+        found = {}
+        with self._lock:
+            placeholders = ",".join("?" * len(keys))
+            rows = self._conn.execute(
+                f"SELECT key, status, reasoning, created_at FROM claim_verdicts WHERE key IN ({placeholders})",
+                list(keys),
+            ).fetchall() if keys else []
+            expired = []
+            for key, status, reasoning, created_at in rows:
+                if self.ttl_seconds is not None and now - created_at > self.ttl_seconds:
+                    expired.append(key)
+                else:
+                    found[keys[key]] = (status, reasoning)
+            if expired:
+                self._conn.executemany("DELETE FROM claim_verdicts WHERE key = ?", [(key,) for key in expired])
+                self._size -= len(expired)
+                self.evictions += len(expired)
+            if found:
+                self._conn.executemany(
+                    "UPDATE claim_verdicts SET last_access = ? WHERE key = ?",
+                    [(now, self._key(scope, claim)) for claim in found],
+                )
+            self._conn.commit()
+            self.hits += len(found)
+            self.misses += len(claims) - len(found)
+        return found
+
+    def update_many(self, verdicts: Dict[str, Tuple[str, str]], scope: str = "") -> None:
+        """Store ``{claim: (status, reasoning)}`` under ``scope`` and evict the least recently used entries."""
+        now = time.time()
+        rows = [
+            (self._key(scope, claim), claim, status, reasoning, now, now)
+            for claim, (status, reasoning) in verdicts.items()
+        ]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO claim_verdicts (key, claim, status, reasoning, created_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            self._size = self._conn.execute("SELECT COUNT(*) FROM claim_verdicts").fetchone()[0]
+            if self._size > self.max_entries:
+                overflow = self._size - self.max_entries
+                self._conn.execute(
+                    "DELETE FROM claim_verdicts WHERE key IN "
+                    "(SELECT key FROM claim_verdicts ORDER BY last_access ASC LIMIT ?)",
+                    (overflow,),
+                )
+                self._size -= overflow
+                self.evictions += overflow
+            self._conn.commit()
+
+    def clear(self) -> None:
+        """Remove every cached verdict."""
+        with self._lock:
+            self._conn.execute("DELETE FROM claim_verdicts")
+            self._conn.commit()
+            self._size = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Return per-claim hit/miss counters for the lifetime of this cache object."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": self._size,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,131 @@
+"""
+Code Gate - Local syntax, lint and unit-test checks run before the LLM reviewer
+"""
+
+import ast
+import os
+import re
+import subprocess
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence
+
+CODE_BLOCK_PATTERN = re.compile(r"```(?:python|py)?\s*\n(.*?)```", re.DOTALL)
+
+
+@dataclass
+class GateResult:
+    passed: bool
+    stage: str
+    problems: List[str] = field(default_factory=list)
+
+    def feedback(self) -> str:
+        """Critique text for the generator, in the same bulleted form the reviewer uses."""
+        return f"Local {self.stage} check failed:\n" + "\n".join(f"- {problem}" for problem in self.problems)
+
+
+def extract_code(text: str) -> str:
+    """Return the Python code in a model response, without markdown fences."""
+    blocks = CODE_BLOCK_PATTERN.findall(text)
+    return "\n\n".join(blocks) if blocks else text
+
+
+def lint(tree: ast.AST, required_names: Sequence[str]) -> List[str]:
+    """A small, dependency-free lint pass over the parsed code."""
+    problems = []
+    defined = {node.name for node in ast.walk(tree) if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef))}
+    for name in required_names:
+        if name not in defined:
+            problems.append(f"`{name}` is not defined.")
+    # Style, such as docstrings, is left to the LLM reviewer; only likely bugs block here.
+    for node in ast.walk(tree):
+        if isinstance(node, ast.ExceptHandler) and node.type is None:
+            problems.append(f"Bare `except:` on line {node.lineno}; catch specific exceptions.")
+    return problems
+
+
+# Runs in the child interpreter: applies the limits there, then runs the candidate file.
+# Setting them in the child rather than via preexec_fn keeps subprocess safe to call from threads.
+SANDBOX_BOOTSTRAP = """
+import runpy, sys
+memory_bytes, cpu_seconds, path = int(sys.argv[1]), int(sys.argv[2]), sys.argv[3]
+try:
+    import resource
+except ImportError:
+    resource = None
+if resource is not None:
+    resource.setrlimit(resource.RLIMIT_AS, (memory_bytes, memory_bytes))
+    resource.setrlimit(resource.RLIMIT_CPU, (cpu_seconds, cpu_seconds))
+sys.argv = [path]
+# Not "__main__": a demo block in the candidate must not run before the tests.
+runpy.run_path(path, run_name="candidate")
+"""
+
+
+def run_test(code: str, test_name: str, test_code: str, timeout: float, memory_bytes: int) -> Optional[str]:
+    """Run one test against the code in an isolated subprocess; return a problem or None."""
+    with tempfile.TemporaryDirectory() as workdir:
+        path = os.path.join(workdir, "candidate.py")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(code + "\n\n" + test_code + "\n")
+        try:
+            completed = subprocess.run(
+                [sys.executable, "-I", "-c", SANDBOX_BOOTSTRAP, str(memory_bytes), str(int(timeout) + 1), path],
+                cwd=workdir,
+                capture_output=True,
+                # A demo that calls input() gets EOF instead of waiting for the timeout.
+                stdin=subprocess.DEVNULL,
+                text=True,
+                timeout=timeout,
+                env={},
+            )
+        except subprocess.TimeoutExpired:
+            return f"{test_name} timed out after {timeout}s."
+    if completed.returncode != 0:
+        error = completed.stderr.strip().splitlines()[-1] if completed.stderr.strip() else f"exit code {completed.returncode}"
+        return f"{test_name} failed: {error}"
+    return None
+
+
+class CodeGate:
+    """Runs syntax, lint and unit-test checks; only code that passes all three goes to the reviewer."""
+
+    def __init__(
+        self,
+        tests: Dict[str, str],
+        required_names: Sequence[str] = (),
+        max_workers: int = 4,
+        timeout: float = 5.0,
+        memory_bytes: int = 256 * 1024 * 1024,
+    ):
+        self.tests = tests
+        self.required_names = required_names
+        self.timeout = timeout
+        self.memory_bytes = memory_bytes
+        self.pool = ThreadPoolExecutor(max_workers=max_workers)
+
+    def check(self, response_text: str) -> GateResult:
+        code = extract_code(response_text)
+        try:
+            tree = ast.parse(code)
+        except SyntaxError as e:
+            return GateResult(False, "syntax", [f"SyntaxError on line {e.lineno}: {e.msg}"])
+
+        problems = lint(tree, self.required_names)
+        if problems:
+            return GateResult(False, "lint", problems)
+
+        # Each test runs in its own sandboxed interpreter, in parallel.
+        futures = [
+            self.pool.submit(run_test, code, name, test_code, self.timeout, self.memory_bytes)
+            for name, test_code in self.tests.items()
+        ]
+        problems = [problem for problem in (future.result() for future in futures) if problem]
+        if problems:
+            return GateResult(False, "unit test", problems)
+        return GateResult(True, "all")
+
+    def close(self) -> None:
+        self.pool.shutdown()
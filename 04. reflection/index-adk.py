@@ -1,11 +1,26 @@
+import re
+import time
 import uuid
-from google.adk.agents import SequentialAgent, LlmAgent
+import asyncio
+from typing import AsyncGenerator, Dict, List, Optional, Tuple
+from pydantic import BaseModel, Field
+from google.adk.agents import BaseAgent, LoopAgent, ParallelAgent, SequentialAgent, LlmAgent
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event, EventActions
 from google.adk.runners import InMemoryRunner
 from google.genai import types
 from dotenv import load_dotenv
+from claim_cache import ClaimVerdictCache, split_claims
 
 load_dotenv()
 GEMINI_MODEL = "gemini-2.0-flash"
+# Number of drafts generated concurrently in best-of-N mode
+N_DRAFTS = 3
+# Upper bound on write-and-check rounds in claim-level review mode
+MAX_REVIEW_ITERATIONS = 3
+# "single", "best_of_n" or "claims"
+REVIEW_MODE = "single"
 
 generator = LlmAgent(
     name="DraftWriter",
@@ -37,10 +52,222 @@ review_pipeline = SequentialAgent(
     sub_agents=[generator, reviewer]
 )
 
-import asyncio
+# --- Best-of-N mode ---
+# N drafts are written concurrently, ranked by a cheap local scorer, and only
+# the best one is stored in 'draft_text' for the fact checker.
+
+# (invocation_id, agent name) -> (start, end) wall-clock times of each draft writer,
+# for the most recent MAX_TIMED_INVOCATIONS invocations
+MAX_TIMED_INVOCATIONS = 100
+draft_timings: Dict[Tuple[str, str], List[float]] = {}
+
+def start_draft_timer(callback_context: CallbackContext) -> Optional[types.Content]:
+    invocations = list(dict.fromkeys(invocation_id for invocation_id, _ in draft_timings))
+    if callback_context.invocation_id not in invocations and len(invocations) >= MAX_TIMED_INVOCATIONS:
+        # Forget the oldest invocation; dicts keep insertion order.
+        oldest = invocations[0]
+        for key in [key for key in draft_timings if key[0] == oldest]:
+            del draft_timings[key]
+    draft_timings[(callback_context.invocation_id, callback_context.agent_name)] = [time.perf_counter(), 0.0]
+    return None
+
+def stop_draft_timer(callback_context: CallbackContext) -> Optional[types.Content]:
+    span = draft_timings.get((callback_context.invocation_id, callback_context.agent_name))
+    if span is not None:
+        span[1] = time.perf_counter()
+    return None
+
+def score_draft(text: str) -> float:
+    """Cheap heuristic quality score for a short informative paragraph."""
+    words = re.findall(r"[A-Za-z0-9']+", text)
+    if not words:
+        return float("-inf")
+    sentences = [s for s in re.split(r"[.!?]+", text) if s.strip()]
+    # Prefer a paragraph of roughly 80-150 words and 3-6 sentences.
+    length_penalty = max(0, 80 - len(words), len(words) - 150) / 20
+    sentence_penalty = max(0, 3 - len(sentences), len(sentences) - 6)
+    # Reward concrete details: dates, numbers and proper nouns.
+    specifics = len(re.findall(r"\b\d{2,4}\b", text)) + len(re.findall(r"(?<![.!?]\s)\b[A-Z][a-z]+", text))
+    specificity = min(specifics / len(words) * 10, 3)
+    repetition = 1 - len({w.lower() for w in words}) / len(words)
+    hedging = len(re.findall(r"\b(maybe|perhaps|might|I think|possibly)\b", text, re.IGNORECASE))
+    return specificity - length_penalty - sentence_penalty - 3 * repetition - hedging
+
+class DraftRanker(BaseAgent):
+    """Scores the candidate drafts and stores the best one as 'draft_text'."""
+
+    draft_keys: List[str]
+
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        drafts = [ctx.session.state.get(key, "") for key in self.draft_keys]
+        # Scoring is a few regexes over short paragraphs, cheaper than a thread hop.
+        scores = [score_draft(draft) for draft in drafts]
+        best = max(range(len(drafts)), key=lambda i: scores[i])
+        yield Event(
+            invocation_id=ctx.invocation_id,
+            author=self.name,
+            content=types.Content(role="model", parts=[types.Part(text=drafts[best])]),
+            actions=EventActions(state_delta={
+                "draft_text": drafts[best],
+                "draft_scores": {key: round(score, 3) for key, score in zip(self.draft_keys, scores)},
+            }),
+        )
+
+draft_writers = [
+    LlmAgent(
+        name=f"DraftWriter{i + 1}",
+        description="A language model that can generate text based on a prompt.",
+        instruction="Write a short, informative paragraph about the user's subject",
+        output_key=f"draft_text_{i + 1}",
+        model=GEMINI_MODEL,
+        # A higher temperature keeps the candidates from being identical.
+        generate_content_config=types.GenerateContentConfig(temperature=0.9),
+        before_agent_callback=start_draft_timer,
+        after_agent_callback=stop_draft_timer,
+    )
+    for i in range(N_DRAFTS)
+]
+
+best_of_n_pipeline = SequentialAgent(
+    name="BestOfNReviewPipeline",
+    sub_agents=[
+        ParallelAgent(name="ParallelDraftWriters", sub_agents=draft_writers),
+        DraftRanker(name="DraftRanker", draft_keys=[writer.output_key for writer in draft_writers]),
+        reviewer.clone(),
+    ]
+)
+
+def report_draft_speedup(invocation_id: str) -> None:
+    """Compare the parallel drafting time with writing the drafts one after another."""
+    spans = [span for (inv, _), span in draft_timings.items() if inv == invocation_id and span[1]]
+    if not spans:
+        return
+    parallel = max(end for _, end in spans) - min(start for start, _ in spans)
+    serial = sum(end - start for start, end in spans)
+    print(f"\nDrafting {len(spans)} candidates: parallel {parallel:.2f}s vs serial {serial:.2f}s "
+          f"(speedup {serial / parallel if parallel else 0:.1f}x)")
+
+# --- Claim-level review mode ---
+# The draft is split into claims; only claims missing from the persistent
+# verdict cache are sent to the LLM, and the loop stops as soon as every
+# claim is accurate.
+
+class ClaimVerdict(BaseModel):
+    index: int = Field(description="The number of the claim in the list")
+    status: str = Field(description='Either "ACCURATE" or "INACCURATE"')
+    reasoning: str = Field(description="A short explanation of the verdict")
+
+class ClaimVerdicts(BaseModel):
+    verdicts: List[ClaimVerdict]
+
+claim_verifier = LlmAgent(
+    name="ClaimVerifier",
+    description="A language model that fact-checks individual claims.",
+    model=GEMINI_MODEL,
+    instruction="""
+You are a meticulous fact-checker.
+Verify the factual accuracy of each numbered claim below on its own:
+{unverified_claims}
+Return one verdict for every claim, using the claim's number as its index,
+with "status" either "ACCURATE" or "INACCURATE" and a short "reasoning".
+""",
+    include_contents="none",
+    output_schema=ClaimVerdicts,
+    output_key="claim_verdicts"
+)
+
+class ClaimFactChecker(BaseAgent):
+    """Checks 'draft_text' claim by claim, sending only uncached claims to the verifier.
+
+    Writes the combined verdict to 'review_output' in the same shape as
+    FactChecker, and escalates when the draft is accurate so an enclosing
+    LoopAgent exits early.
+    """
+
+    verifier: LlmAgent
+    cache: ClaimVerdictCache
+
+    def __init__(self, name: str, verifier: LlmAgent, cache: ClaimVerdictCache):
+        super().__init__(name=name, verifier=verifier, cache=cache, sub_agents=[verifier])
+
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        claims = split_claims(ctx.session.state.get("draft_text", ""))
+        # Verdicts are cached per subject, since a claim's truth can depend on what it is about.
+        subject = "".join(part.text or "" for part in ctx.user_content.parts) if ctx.user_content else ""
+        verdicts = await asyncio.to_thread(self.cache.lookup_many, claims, subject)
+        unseen = [claim for claim in claims if claim not in verdicts]
+
+        if unseen:
+            yield Event(
+                invocation_id=ctx.invocation_id,
+                author=self.name,
+                actions=EventActions(state_delta={
+                    "unverified_claims": "\n".join(f"{i}. {claim}" for i, claim in enumerate(unseen)),
+                    # Verdicts of the previous round refer to other claims; never match them to these.
+                    "claim_verdicts": None,
+                }),
+            )
+            async for event in self.verifier.run_async(ctx):
+                yield event
+            result = ctx.session.state.get("claim_verdicts") or {}
+            checked = {item["index"]: item for item in result.get("verdicts", [])}
+            new_verdicts = {}
+            for i, claim in enumerate(unseen):
+                item = checked.get(i)
+                if item is None:
+                    # A claim the model skipped is not cached and counts against the draft.
+                    verdicts[claim] = ("INACCURATE", "The claim could not be verified.")
+                    continue
+                status = "ACCURATE" if item["status"].strip().upper() == "ACCURATE" else "INACCURATE"
+                new_verdicts[claim] = (status, item["reasoning"])
+            await asyncio.to_thread(self.cache.update_many, new_verdicts, subject)
+            verdicts.update(new_verdicts)
+
+        problems = [f"- {claim} ({verdicts[claim][1]})" for claim in claims if verdicts[claim][0] != "ACCURATE"]
+        status = "ACCURATE" if claims and not problems else "INACCURATE"
+        if not claims:
+            reasoning = "The draft contains no checkable claims."
+        elif problems:
+            reasoning = "Inaccurate claims:\n" + "\n".join(problems)
+        else:
+            reasoning = f"All {len(claims)} claims verified ({len(claims) - len(unseen)} from cache)."
+        review = {"status": status, "reasoning": reasoning}
+        yield Event(
+            invocation_id=ctx.invocation_id,
+            author=self.name,
+            content=types.Content(role="model", parts=[types.Part(text=str(review))]),
+            actions=EventActions(state_delta={"review_output": review}, escalate=status == "ACCURATE"),
+        )
+
+claim_cache = ClaimVerdictCache("claim_cache.db")
+
+claim_review_loop = LoopAgent(
+    name="ClaimReviewLoop",
+    sub_agents=[
+        LlmAgent(
+            name="DraftWriter",
+            description="A language model that can generate text based on a prompt.",
+            instruction="""Write a short, informative paragraph about the user's subject.
+If there is a previous review below, rewrite the paragraph so that the inaccurate claims it lists are corrected.
+
+Previous review: {review_output?}""",
+            output_key="draft_text",
+            model=GEMINI_MODEL
+        ),
+        ClaimFactChecker(name="ClaimFactChecker", verifier=claim_verifier, cache=claim_cache),
+    ],
+    max_iterations=MAX_REVIEW_ITERATIONS
+)
+
+PIPELINES = {
+    "single": review_pipeline,
+    "best_of_n": best_of_n_pipeline,
+    "claims": claim_review_loop,
+}
 
 async def main():
-  runner = InMemoryRunner(app_name="ParallelizationApp", agent=review_pipeline)
+  pipeline = PIPELINES[REVIEW_MODE]
+  runner = InMemoryRunner(app_name="ParallelizationApp", agent=pipeline)
   user_id = "user234"
   session_id = str(uuid.uuid4())
   await runner.session_service.create_session(
@@ -56,8 +283,15 @@ async def main():
         ),
 
   )
+  invocation_id = None
   for result in result_gen:
+    invocation_id = result.invocation_id
     print(result)
+  if REVIEW_MODE == "best_of_n" and invocation_id:
+    report_draft_speedup(invocation_id)
+  if REVIEW_MODE == "claims":
+    print(f"\nClaim cache stats: {claim_cache.stats()}")
+    claim_cache.close()
 
 if __name__ == "__main__":
   asyncio.run(main())
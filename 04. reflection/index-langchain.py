@@ -1,18 +1,77 @@
 import os
 import asyncio
-from typing import Optional
+from typing import Dict, List, Optional
 from urllib import response
 
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.messages import SystemMessage, HumanMessage
+from langchain_core.messages import SystemMessage, HumanMessage, AIMessage
 from dotenv import load_dotenv
+from code_gate import CodeGate
 
 load_dotenv()
 
 llm = ChatGoogleGenerativeAI(model="gemini-2.5-pro", api_key=os.getenv("GEMINI_API_KEY"))
 
-def run_reflection_loop():
+REFLECTOR_SYSTEM_PROMPT = """
+        You are a senior software engineer and an expert
+        in Python.
+        Your role is to perform a meticulous code review.
+        Critically evaluate the provided Python code based
+        on the original task requirements.
+        Look for bugs, style issues, missing edge cases,
+        and areas for improvement.
+        If the code is perfect and meets all requirements,
+        respond with the single phrase 'CODE_IS_PERFECT'.
+        Otherwise, provide a bulleted list of your critiques.
+        """
+
+def summarize_critiques(critiques: List[str], max_chars: int = 1500) -> str:
+    """Condense earlier critiques into a de-duplicated list of their bullet points.
+
+    Runs locally, so compacting the history costs no extra LLM call.
+    """
+    seen, points = set(), []
+    for critique in critiques:
+        for line in critique.splitlines():
+            point = line.strip().lstrip("-*• ").strip()
+            if point and point.lower() not in seen:
+                seen.add(point.lower())
+                points.append(f"- {point}")
+    summary = "\n".join(points)
+    if len(summary) > max_chars:
+        # Keep the most recent points.
+        summary = "...\n" + summary[-max_chars:].split("\n", 1)[-1]
+    return summary
+
+def token_usage(message) -> Dict[str, int]:
+    usage = getattr(message, "usage_metadata", None) or {}
+    return {"input": usage.get("input_tokens", 0), "output": usage.get("output_tokens", 0)}
+
+# Local checks for the factorial task, run before paying for a reviewer call
+FACTORIAL_TESTS = {
+    "test_zero": "assert calculate_factorial(0) == 1",
+    "test_small": "assert calculate_factorial(5) == 120",
+    "test_negative": (
+        "try:\n"
+        "    calculate_factorial(-1)\n"
+        "except ValueError:\n"
+        "    pass\n"
+        "else:\n"
+        "    raise AssertionError('expected ValueError for a negative input')"
+    ),
+}
+
+def run_reflection_loop(max_iterations: int = 3, compact_history: bool = True, local_gate: bool = True):
+    """Generate code and refine it with critiques from a reviewer.
+
+    With ``compact_history`` the generator is sent only the task, the latest
+    code, the latest critique and a summary of earlier critiques, so each
+    iteration costs about the same instead of growing with the history.
+
+    With ``local_gate`` the code is first parsed, linted and unit-tested
+    locally; failures go straight back to the generator without a reviewer call.
+    """
     task_prompt = """
     Your task is to create a Python function named
 `calculate_factorial`.
@@ -25,48 +84,70 @@ This function should do the following:
 negative number.
 """
 
-    max_iterations = 3
     current_code = ""
     message_history = [HumanMessage(content=task_prompt)]
+    critiques: List[str] = []
+    usage_per_iteration = []
+    gate = CodeGate(FACTORIAL_TESTS, required_names=["calculate_factorial"]) if local_gate else None
+    reviewer_calls_skipped = 0
 
     for i in range(max_iterations):
         print("\n" + "="*25 + f" REFLECTION LOOP: ITERATION {i + 1} "+ "="*25)
         if(i == 0):
             response = llm.invoke(message_history)
-            current_code = response.content
+        elif compact_history:
+            compact_messages = [HumanMessage(content=task_prompt), AIMessage(content=current_code)]
+            if len(critiques) > 1:
+                compact_messages.append(HumanMessage(
+                    content=f"Summary of earlier critiques:\n{summarize_critiques(critiques[:-1])}"
+                ))
+            compact_messages.append(HumanMessage(
+                content=f"Critique of the previous code:\n{critiques[-1]}\n\nPlease refine the code using the critiques provided."
+            ))
+            response = llm.invoke(compact_messages)
         else:
             message_history.append(HumanMessage(content="Please refine the code using the critiques provided."))
             response = llm.invoke(message_history)
-            current_code = response.content
+        current_code = response.content
         print("\n--- Generated Code (v" + str(i + 1) + ") ---\n" + current_code)
         message_history.append(response)
 
-        print("\n>>> STAGE 2: REFLECTING on the generated code...")
-        reflector_prompt = [SystemMessage(content="""
-        You are a senior software engineer and an expert
-        in Python.
-        Your role is to perform a meticulous code review.
-        Critically evaluate the provided Python code based
-        on the original task requirements.
-        Look for bugs, style issues, missing edge cases,
-        and areas for improvement.
-        If the code is perfect and meets all requirements,
-        respond with the single phrase 'CODE_IS_PERFECT'.
-        Otherwise, provide a bulleted list of your critiques.
-        """),
-        HumanMessage(content=f"Original Task:\n{task_prompt}\n\nCode to Review:\n{current_code}")]
-            
-        critique_response = llm.invoke(reflector_prompt)
-        critique = critique_response.content
+        gate_result = gate.check(current_code) if gate else None
+        if gate_result is not None and not gate_result.passed:
+            print(f"\n>>> STAGE 2: LOCAL {gate_result.stage.upper()} CHECK FAILED, skipping the reviewer...")
+            critique = gate_result.feedback()
+            reviewer_calls_skipped += 1
+            usage_per_iteration.append((token_usage(response), token_usage(None)))
+        else:
+            print("\n>>> STAGE 2: REFLECTING on the generated code...")
+            reflector_prompt = [SystemMessage(content=REFLECTOR_SYSTEM_PROMPT),
+            HumanMessage(content=f"Original Task:\n{task_prompt}\n\nCode to Review:\n{current_code}")]
+
+            critique_response = llm.invoke(reflector_prompt)
+            critique = critique_response.content
+            usage_per_iteration.append((token_usage(response), token_usage(critique_response)))
 
         if "CODE_IS_PERFECT" in critique:
             print("\n--- Critique ---\nNo further critiques found. The code is satisfactory.")
             break
-            print("\n--- Critique ---\n" + critique)
-            # Add the critique to the history for the next refinement loop.
-            message_history.append(HumanMessage(content=f"Critique of the previous code:\n{critique}"))
-            print("\n" + "="*30 + " FINAL RESULT " + "="*30)
-            print("\nFinal refined code after the reflection process:\n")
-            print(current_code)
+        print("\n--- Critique ---\n" + critique)
+        critiques.append(critique)
+        # Add the critique to the history for the next refinement loop.
+        message_history.append(HumanMessage(content=f"Critique of the previous code:\n{critique}"))
+
+    print("\n" + "="*30 + " FINAL RESULT " + "="*30)
+    print("\nFinal refined code after the reflection process:\n")
+    print(current_code)
+
+    print("\n--- Token usage per iteration (input/output) ---")
+    for i, (generator, reviewer) in enumerate(usage_per_iteration, start=1):
+        print(
+            f"Iteration {i}: generator {generator['input']}/{generator['output']}, "
+            f"reviewer {reviewer['input']}/{reviewer['output']}"
+        )
+    print(f"Reviewer calls skipped by the local gate: {reviewer_calls_skipped}")
+    if gate:
+        gate.close()
+
 if __name__ == "__main__":
-    run_reflection_loop()
\ No newline at end of file
+    run_reflection_loop()
@@ -0,0 +1,187 @@
+"""
+Agent Pool - Rate-limited, fair worker pool for running many agent queries
+"""
+
+import asyncio
+import math
+import time
+from collections import OrderedDict, deque
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def is_rate_limit_error(error: Exception) -> bool:
+    """True for provider 429 / quota errors, which are worth retrying."""
+    text = f"{type(error).__name__} {error}"
+    return "429" in text or "RESOURCE_EXHAUSTED" in text or "ResourceExhausted" in text
+
+
+class TokenBucket:
+    """Async token bucket refilled continuously at ``rate`` per second up to ``capacity``."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.total_wait = 0.0
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self, amount: float = 1.0) -> None:
+        """Wait until ``amount`` tokens are available and take them."""
+        # A request larger than the bucket would never fit; let it drain the bucket instead.
+        amount = min(amount, self.capacity)
+        # The lock makes waiters take tokens in arrival order.
+        async with self._lock:
+            started = time.monotonic()
+            self._refill()
+            while self.tokens < amount:
+                await asyncio.sleep((amount - self.tokens) / self.rate)
+                self._refill()
+            self.tokens -= amount
+            self.total_wait += time.monotonic() - started
+
+
+class AgentWorkerPool:
+    """Runs queries through an async handler with rate limits, backpressure and fairness.
+
+    ``submit`` enqueues a query for a tenant and returns a future for its
+    result. At most ``max_queued`` queries wait at once; beyond that
+    ``submit`` blocks, which pushes back on the producer instead of growing
+    memory. ``workers`` tasks take queries from the tenants' queues in
+    round-robin order, so one busy tenant cannot starve the others. Before each
+    call a worker takes one token from the request bucket and the query's
+    estimated token count from the token bucket. Calls that fail with a 429
+    are retried with exponential backoff.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[str], Awaitable[Any]],
+        workers: int = 8,
+        max_queued: int = 100,
+        requests_per_minute: float = 60,
+        tokens_per_minute: float = 100_000,
+        estimate_tokens: Optional[Callable[[str], int]] = None,
+        max_retries: int = 3,
+        backoff_seconds: float = 1.0,
+    ):
+        self.handler = handler
+        self.workers = workers
+        self.request_bucket = TokenBucket(requests_per_minute / 60, max(1.0, requests_per_minute / 60))
+        self.token_bucket = TokenBucket(tokens_per_minute / 60, tokens_per_minute / 60)
+        # An agent run costs its prompt plus tool round trips; a flat overhead approximates both.
+        self.estimate_tokens = estimate_tokens or (lambda query: len(query) // 4 + 1000)
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self._slots = asyncio.Semaphore(max_queued)
+        self._tenants: "OrderedDict[str, deque]" = OrderedDict()
+        self._ready = asyncio.Condition()
+        self._tasks: List[asyncio.Task] = []
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.retries = 0
+        self.queued = 0
+        self.max_queued_seen = 0
+        self.latencies: List[float] = []
+        self.queue_waits: List[float] = []
+        self.per_tenant: Dict[str, int] = {}
+        self.started_at: Optional[float] = None
+
+    def start(self) -> "AgentWorkerPool":
+        self.started_at = time.perf_counter()
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        return self
+
+    async def submit(self, query: str, tenant: str = "default") -> asyncio.Future:
+        """Enqueue a query, waiting while the queue is full; returns a future for the result."""
+        await self._slots.acquire()
+        future = asyncio.get_running_loop().create_future()
+        async with self._ready:
+            self._tenants.setdefault(tenant, deque()).append((query, future, time.perf_counter()))
+            self.submitted += 1
+            self.queued += 1
+            self.max_queued_seen = max(self.max_queued_seen, self.queued)
+            self._ready.notify()
+        return future
+
+    async def _next_job(self) -> tuple:
+        async with self._ready:
+            await self._ready.wait_for(lambda: self.queued > 0)
+            # Round robin: serve the first tenant with work, then move it to the back.
+            tenant, jobs = next((tenant, jobs) for tenant, jobs in self._tenants.items() if jobs)
+            self._tenants.move_to_end(tenant)
+            self.queued -= 1
+            return (tenant, *jobs.popleft())
+
+    async def _worker(self) -> None:
+        while True:
+            tenant, query, future, enqueued_at = await self._next_job()
+            self._slots.release()
+            self.queue_waits.append(time.perf_counter() - enqueued_at)
+            try:
+                result = await self._call(query)
+            except Exception as e:
+                self.failed += 1
+                if not future.done():
+                    future.set_exception(e)
+            else:
+                self.completed += 1
+                self.per_tenant[tenant] = self.per_tenant.get(tenant, 0) + 1
+                if not future.done():
+                    future.set_result(result)
+            self.latencies.append(time.perf_counter() - enqueued_at)
+
+    async def _call(self, query: str) -> Any:
+        for attempt in range(self.max_retries + 1):
+            await self.request_bucket.acquire()
+            await self.token_bucket.acquire(self.estimate_tokens(query))
+            try:
+                return await self.handler(query)
+            except Exception as e:
+                if attempt == self.max_retries or not is_rate_limit_error(e):
+                    raise
+                self.retries += 1
+                await asyncio.sleep(self.backoff_seconds * 2 ** attempt)
+
+    def report(self) -> Dict[str, Any]:
+        """Throughput and latency summary since start()."""
+        elapsed = time.perf_counter() - self.started_at if self.started_at else 0.0
+        latencies = sorted(self.latencies)
+        waits = sorted(self.queue_waits)
+        return {
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+            "rate_limit_retries": self.retries,
+            "throughput_per_second": self.completed / elapsed if elapsed else 0.0,
+            "latency_p50": percentile(latencies, 50),
+            "latency_p95": percentile(latencies, 95),
+            "latency_p99": percentile(latencies, 99),
+            "queue_wait_p95": percentile(waits, 95),
+            "max_queued": self.max_queued_seen,
+            "rate_limiter_wait_seconds": self.request_bucket.total_wait + self.token_bucket.total_wait,
+            "completed_per_tenant": dict(self.per_tenant),
+        }
+
+    async def close(self) -> None:
+        """Stop the workers; queries still queued are cancelled."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        for jobs in self._tenants.values():
+            for _, future, _ in jobs:
+                future.cancel()
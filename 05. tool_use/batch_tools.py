@@ -0,0 +1,87 @@
+"""
+Batch Tools - Batch-capable CrewAI tools backed by a sorted NumPy key index
+"""
+
+import functools
+import inspect
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence
+
+import numpy as np
+from crewai.tools import tool
+
+
+class SortedKeyIndex:
+    """Read-only key -> float index built once from a mapping.
+
+    Keys are kept in a sorted NumPy array so a whole list of keys is resolved
+    with one vectorized ``searchsorted`` instead of one dict lookup per call.
+    """
+
+    def __init__(self, mapping: Mapping[str, float]):
+        keys = sorted(mapping)
+        self.keys = np.array(keys, dtype=str)
+        self.values = np.array([mapping[key] for key in keys], dtype=float)
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def lookup(self, keys: Sequence[str]) -> np.ndarray:
+        """Return the values for ``keys``, with NaN where a key is missing."""
+        if len(keys) == 0 or len(self.keys) == 0:
+            return np.full(len(keys), np.nan)
+        wanted = np.array(keys, dtype=str)
+        positions = np.searchsorted(self.keys, wanted)
+        positions = np.minimum(positions, len(self.keys) - 1)
+        found = self.keys[positions] == wanted
+        return np.where(found, self.values[positions], np.nan)
+
+
+# name -> counters for every tool declared with batch_tool
+BATCH_TOOL_STATS: Dict[str, Dict[str, int]] = {}
+
+
+def batch_tool(name: str, normalize: Optional[Callable[[str], str]] = None, max_cached: int = 4096):
+    """Declare a CrewAI tool that resolves a list of keys in one call.
+
+    The decorated function takes a list of keys and returns one result per
+    key, in order. Results are memoized per key (LRU, ``max_cached``
+    entries), so the function only sees the keys not resolved before, in a
+    single batch. ``normalize`` canonicalizes keys first, e.g. ``str.upper``
+    for tickers. The function's signature and docstring become the tool's
+    schema and description, as with ``@tool``.
+    """
+    def decorator(fn: Callable[[List[str]], List[Any]]):
+        signature = inspect.signature(fn)
+        memo: "OrderedDict[str, Any]" = OrderedDict()
+        lock = threading.Lock()
+        stats = BATCH_TOOL_STATS.setdefault(name, {"calls": 0, "keys": 0, "memo_hits": 0, "batches": 0})
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            keys = [normalize(key) if normalize else key for key in next(iter(bound.arguments.values()))]
+            resolved = {}
+            with lock:
+                for key in keys:
+                    if key in memo:
+                        memo.move_to_end(key)
+                        resolved[key] = memo[key]
+                stats["calls"] += 1
+                stats["keys"] += len(keys)
+                stats["memo_hits"] += sum(1 for key in keys if key in resolved)
+            missing = [key for key in dict.fromkeys(keys) if key not in resolved]
+            if missing:
+                results = fn(missing)
+                resolved.update(zip(missing, results))
+                with lock:
+                    stats["batches"] += 1
+                    memo.update(zip(missing, results))
+                    while len(memo) > max_cached:
+                        memo.popitem(last=False)
+            return [resolved[key] for key in keys]
+
+        return tool(name)(wrapper)
+
+    return decorator
@@ -1,4 +1,5 @@
 from google.adk.agents import Agent as ADKAgent, LlmAgent
+from google.adk.artifacts import InMemoryArtifactService
 from google.adk.runners import Runner
 from google.adk.sessions import InMemorySessionService
 from google.adk.code_executors import BuiltInCodeExecutor
@@ -8,27 +9,41 @@ import nest_asyncio
 import asyncio
 from typing import List
 from dotenv import load_dotenv
+from warm_code_executor import LocalWarmCodeExecutor
 load_dotenv()
 
 # Define variables required for Session setup and Agent execution
 APP_NAME="Google Search_agent"
 USER_ID="user1234"
 SESSION_ID="1234"
+# Run the generated code on local warm worker processes instead of the model-side BuiltInCodeExecutor
+USE_LOCAL_EXECUTOR = True
+
+if USE_LOCAL_EXECUTOR:
+    code_executor = LocalWarmCodeExecutor(pool_size=2, max_runs_per_worker=50, cpu_timeout_seconds=2.0)
+    instruction = """
+You are a calculator agent. When given a mathematical expression, write Python code in a ```python block that prints the result.
+After you see the output, return only the final numerical result as plain text without markdown or code blocks"""
+else:
+    code_executor = BuiltInCodeExecutor()
+    instruction = """
+You are a calculator agent. When given a mathematical expression, you should evaluate it and return the result.
+Return only the final numeerical result as plaint text without markdown or code blocks"""
 
 code_agent = LlmAgent(
     name="calculator_agent",
     model="gemini-2.0-flash",
-    code_executor=BuiltInCodeExecutor(),
+    code_executor=code_executor,
     description="Executes python code to do calculations",
-    instruction="""
-You are a calculator agent. When given a mathematical expression, you should evaluate it and return the result.
-Return only the final numeerical result as plaint text without markdown or code blocks"""
+    instruction=instruction
 )
 
 async def call_agent_async(query):
     session_service = InMemorySessionService()
     session = await session_service.create_session(app_name=APP_NAME, user_id=USER_ID, session_id=SESSION_ID)
-    runner = Runner(agent=code_agent, app_name=APP_NAME, session_service=session_service)
+    # Locally executed code results are saved through the artifact service.
+    runner = Runner(agent=code_agent, app_name=APP_NAME, session_service=session_service,
+                    artifact_service=InMemoryArtifactService())
 
     content = types.Content(role='user', parts=[types.Part(text=query)])
     final_response_text = "No final text response captured."
@@ -62,6 +77,9 @@ async def call_agent_async(query):
 async def main():
     await call_agent_async("Calculate the value of (5 + 7) * 3")
     await call_agent_async("What is 10 factorial?")
+    if USE_LOCAL_EXECUTOR:
+        print(f"Code executor stats: {code_executor.stats()}")
+        code_executor.close()
 
 nest_asyncio.apply()
 asyncio.run(main())
\ No newline at end of file
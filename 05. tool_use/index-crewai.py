@@ -1,11 +1,21 @@
 import os
+import math
+from typing import List, Optional
 from crewai import Agent, Task, Crew, LLM
 from crewai.tools import tool
 from dotenv import load_dotenv
+from batch_tools import BATCH_TOOL_STATS, SortedKeyIndex, batch_tool
 
 load_dotenv()
 api_key = os.getenv("GEMINI_API_KEY")
 
+# Price index built once at import time and shared by both tools
+SIMULATED_PRICES = SortedKeyIndex({
+    "AAPL": 178.15,
+    "GOOGL": 1750.30,
+    "MSFT": 425.50,
+})
+
 @tool("Stock Price Lookup Tool")
 def get_stock_price(ticker: str) -> float:
     """
@@ -14,19 +24,25 @@ def get_stock_price(ticker: str) -> float:
     Returns the price as a float. Raises a ValueError if the ticker is
     not found.
     """
-    simulated_prices = {
-    "AAPL": 178.15,
-    "GOOGL": 1750.30,
-    "MSFT": 425.50,
-    }
-    price = simulated_prices.get(ticker.upper())
-    if price is not None:
-     return price
+    price = SIMULATED_PRICES.lookup([ticker.upper()])[0]
+    if not math.isnan(price):
+     return float(price)
     else:
         # Raising a specific error is better than returning a string.
         # The agent is equipped to handle exceptions and can decide on the next action.
         raise ValueError(f"Simulated price for ticker '{ticker.upper()}' not found.")
 
+@batch_tool("Portfolio Price Lookup Tool", normalize=str.upper)
+def get_stock_prices(tickers: List[str]) -> List[Optional[float]]:
+    """
+    Fetches the latest simulated stock prices for a list of stock ticker
+    symbols in a single call. Use this instead of looking up tickers one
+    at a time. Returns one price per ticker, in the same order, with None
+    for tickers that are not found.
+    """
+    prices = SIMULATED_PRICES.lookup(tickers)
+    return [None if math.isnan(price) else float(price) for price in prices]
+
 # Configure Gemini LLM
 def setup_gemini_llm():
     """Setup and return a Gemini LLM instance for CrewAI"""
@@ -47,7 +63,7 @@ financial_analyst_agent = Agent(
     goal='Analyze stock data using provided tools and report key prices.',
     backstory="You are an experienced financial analyst adept at using data sources to find stock information. You provide clear, direct answers.",
     verbose=True,
-    tools=[get_stock_price],
+    tools=[get_stock_price, get_stock_prices],
     llm=gemini_llm,  # Use Gemini as the LLM backend
     # Allowing delegation can be useful, but is not necessary for this simple task.
     allow_delegation=False,
@@ -67,9 +83,23 @@ analyze_aapl_task = Task(
 agent=financial_analyst_agent,
 )
 
+analyze_portfolio_task = Task(
+    description=(
+        "What are the current simulated stock prices for a portfolio of "
+        "AAPL, MSFT, GOOGL and NVDA? "
+        "Use the 'Portfolio Price Lookup Tool' once with all of the tickers. "
+        "Report any ticker whose price could not be retrieved."
+    ),
+    expected_output=(
+        "One line per ticker with its simulated price, "
+        "stating clearly for any ticker that its price was not found."
+    ),
+    agent=financial_analyst_agent,
+)
+
 financial_crew = Crew(
     agents=[financial_analyst_agent],
-    tasks=[analyze_aapl_task],
+    tasks=[analyze_aapl_task, analyze_portfolio_task],
     verbose=True # Set to False for less detailed logs in production
 )
 
@@ -89,6 +119,7 @@ def main():
         print("\n---------------------------------")
         print("## Crew execution finished.")
         print("\nFinal Result:\n", result)
+        print("\nBatch tool stats:", BATCH_TOOL_STATS)
     except Exception as e:
         print(f"Error running the crew: {e}")
         print("Make sure you have set the GOOGLE_API_KEY environment variable with a valid Gemini API key.")
@@ -1,20 +1,38 @@
 from asyncio import tasks
 import os
 import asyncio
-import nest_asyncio
 from typing import List
 from dotenv import load_dotenv
 import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 from langchain_google_genai import ChatGoogleGenerativeAI
+from langchain_core.messages import ToolMessage
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.tools import tool as langchain_tool
 from langchain.agents import create_tool_calling_agent, AgentExecutor
+from agent_pool import AgentWorkerPool
+from tool_registry import ToolRegistry
 
 load_dotenv()
 
 llm = ChatGoogleGenerativeAI(model="gemini-2.0-flash", api_key=os.getenv("GEMINI_API_KEY"))
 
+# Opt-in: run the tool calls of one model turn concurrently (see run_agent_concurrent_tools)
+# instead of one after another through AgentExecutor
+CONCURRENT_TOOL_CALLS = False
+# Bounded pool for sync tools, shared by every agent
+tool_thread_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="tool")
+
+# Lookup index for search_information, built once at import time.
+SIMULATED_RESULTS = {
+    "weather in london?": "The weather in London is currently cloudy with a temperature of 15°C.",
+    "capital of france": "The capital of France is Paris.",
+    "population of earth": "The estimated population of Earth is around 8 billion people.",
+    "tallest mountain": "Mount Everest is the tallest mountain above sea level.",
+}
+
 @langchain_tool
 def search_information(query: str) -> str:
     """
@@ -24,16 +42,18 @@ like 'capital of France' or 'weather in London?'.
 """
     print("search_information tool called", query)
 
-    simulated_results = {
-        "weather in london?": "The weather in London is currently cloudy with a temperature of 15°C.",
-        "capital of france": "The capital of France is Paris.",
-        "population of earth": "The estimated population of Earth is around 8 billion people.",
-        "tallest mountain": "Mount Everest is the tallest mountain above sea level.",
-        "default": f"Simulated search result for '{query}': No specific information found, but the topic seems interesting."
-    }
-    return simulated_results.get(query.lower(), simulated_results["default"])   
+    result = SIMULATED_RESULTS.get(query.lower())
+    if result is None:
+        return f"Simulated search result for '{query}': No specific information found, but the topic seems interesting."
+    return result
+
+# Concurrent agents asking the same question share one tool execution and
+# later ones are answered from the cache.
+tool_registry = ToolRegistry(default_ttl_seconds=300, executor=tool_thread_pool)
 
-tools = [search_information]
+tools = [
+    tool_registry.register(search_information, key_fn=lambda args: args["query"].strip().lower()),
+]
 
 agent_prompt = ChatPromptTemplate.from_messages([
     ("system", "You are a helpful assistant."),
@@ -45,16 +65,98 @@ agent = create_tool_calling_agent(llm, tools, agent_prompt)
 
 agent_executor = AgentExecutor(agent=agent, verbose=False, tools=tools)
 
-async def run_agent_with_tool(query: str):
-    response = await agent_executor.ainvoke({"input": query})
-    print(response["output"])
+# --- Concurrent tool-call mode ---
+# The independent tool calls of one model turn are dispatched together: async
+# tools on the event loop, sync tools on the bounded thread pool. Results are
+# returned to the model in the order it asked for them, so a step takes as
+# long as its slowest tool rather than the sum of all of them.
+
+tools_by_name = {tool.name: tool for tool in tools}
+llm_with_tools = llm.bind_tools(tools)
+
+async def call_tool(tool_call: dict) -> tuple:
+    """Run one tool call and return its ToolMessage and duration."""
+    started = time.perf_counter()
+    tool = tools_by_name.get(tool_call["name"])
+    try:
+        if tool is None:
+            content = f"Error: unknown tool '{tool_call['name']}'."
+        elif tool.coroutine is not None:
+            content = await tool.ainvoke(tool_call["args"])
+        else:
+            content = await asyncio.get_running_loop().run_in_executor(
+                tool_thread_pool, tool.invoke, tool_call["args"]
+            )
+    except Exception as e:
+        # Report the failure to the model instead of failing the other calls.
+        content = f"Error: {e}"
+    message = ToolMessage(content=str(content), tool_call_id=tool_call["id"], name=tool_call["name"])
+    return message, time.perf_counter() - started
+
+def content_text(content) -> str:
+    """Text of a message's content, which is a string or a list of content blocks."""
+    if isinstance(content, str):
+        return content
+    return "".join(block if isinstance(block, str) else block.get("text", "") for block in content)
+
+async def run_agent_concurrent_tools(query: str) -> dict:
+    """Tool-calling loop with concurrent tool calls, returning the same keys as AgentExecutor.
+
+    Stops after the executor's ``max_iterations`` model turns, as AgentExecutor does.
+    Tool errors are reported back to the model, and every call is kept in
+    ``intermediate_steps`` as ``(tool_call, observation)``.
+    """
+    messages = agent_prompt.format_messages(input=query, agent_scratchpad=[])
+    intermediate_steps = []
+    max_iterations = agent_executor.max_iterations
+    step = 0
+    while max_iterations is None or step < max_iterations:
+        ai_message = await llm_with_tools.ainvoke(messages)
+        messages.append(ai_message)
+        if not ai_message.tool_calls:
+            return {"input": query, "output": content_text(ai_message.content), "intermediate_steps": intermediate_steps}
+        step += 1
+        started = time.perf_counter()
+        # gather preserves the order of the tool calls.
+        results = await asyncio.gather(*(call_tool(tool_call) for tool_call in ai_message.tool_calls))
+        durations = [duration for _, duration in results]
+        print(f"Step {step}: {len(results)} tool calls in {time.perf_counter() - started:.2f}s "
+              f"(slowest {max(durations):.2f}s, sum {sum(durations):.2f}s)")
+        messages.extend(message for message, _ in results)
+        intermediate_steps.extend((tool_call, message.content) for tool_call, (message, _) in zip(ai_message.tool_calls, results))
+    # Same message as AgentExecutor's default "force" early stopping.
+    return {"input": query, "output": "Agent stopped due to iteration limit or time limit.",
+            "intermediate_steps": intermediate_steps}
+
+async def run_agent_with_tool(query: str) -> str:
+    if CONCURRENT_TOOL_CALLS:
+        response = await run_agent_concurrent_tools(query)
+    else:
+        response = await agent_executor.ainvoke({"input": query})
+    return response["output"]
 
 async def main():
-    tasks = [
-        run_agent_with_tool("What is the capital of France?"),
-        run_agent_with_tool("What's the weather like in London?"),
-        run_agent_with_tool("Tell me something about dogs.") 
-        ]
-    await asyncio.gather(*tasks)
-nest_asyncio.apply()
+    # (tenant, query) pairs; the pool serves tenants in turn, not in submission order.
+    queries = [
+        ("alice", "What is the capital of France?"),
+        ("alice", "What's the weather like in London?"),
+        ("bob", "Tell me something about dogs."),
+    ]
+    pool = AgentWorkerPool(
+        run_agent_with_tool,
+        workers=4,
+        max_queued=50,
+        requests_per_minute=60,
+        tokens_per_minute=100_000,
+    ).start()
+    # submit() blocks while the queue is full, so a large query list is fed in gradually.
+    futures = [await pool.submit(query, tenant) for tenant, query in queries]
+    results = await asyncio.gather(*futures, return_exceptions=True)
+    for (_, query), result in zip(queries, results):
+        print(f"\nQuery: {query}\nResult: {result}")
+    print(f"\nAgent pool report: {pool.report()}")
+    await pool.close()
+    for name, stats in tool_registry.stats().items():
+        print(f"\nTool stats for {name}: {stats}")
+    tool_thread_pool.shutdown()
 asyncio.run(main())
\ No newline at end of file
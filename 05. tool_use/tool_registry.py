@@ -0,0 +1,196 @@
+"""
+Tool Registry - TTL result caching and single-flight execution for LangChain tools
+"""
+
+import asyncio
+import json
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Executor, Future
+from typing import Any, Callable, Dict, Optional
+
+from langchain_core.tools import BaseTool, StructuredTool
+
+
+class _Abandoned(Exception):
+    """Set on a shared call whose owner was cancelled; its waiters claim the call again."""
+
+
+class ToolStats:
+    """Counters for one registered tool."""
+
+    def __init__(self):
+        self.calls = 0
+        self.executions = 0
+        self.cache_hits = 0
+        self.coalesced = 0
+        self.errors = 0
+        self.total_execution_seconds = 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "executions": self.executions,
+            "cache_hits": self.cache_hits,
+            "coalesced": self.coalesced,
+            "errors": self.errors,
+            "hit_rate": (self.cache_hits + self.coalesced) / self.calls if self.calls else 0.0,
+            "avg_execution_seconds": self.total_execution_seconds / self.executions if self.executions else 0.0,
+        }
+
+
+class ToolRegistry:
+    """Wraps ``@langchain_tool`` functions with a result cache and single-flight calls.
+
+    ``register`` returns a tool with the same name, description and argument
+    schema, so it can be handed to an agent in place of the original. A call
+    whose arguments are already cached is answered without running the tool;
+    identical calls that arrive while one is still running wait for that
+    execution instead of starting their own. This holds for concurrent agents
+    on one event loop and for sync tools run in executor threads alike.
+    Failed executions are shared with the waiting callers but not cached;
+    if the executing call is cancelled, a waiter runs the tool instead.
+    Sync tools called asynchronously run on ``executor`` (the loop's default
+    executor if None).
+    """
+
+    def __init__(self, default_ttl_seconds: Optional[float] = 300.0, max_entries: int = 1024,
+                 executor: Optional[Executor] = None):
+        self.default_ttl_seconds = default_ttl_seconds
+        self.max_entries = max_entries
+        self.executor = executor
+        self._lock = threading.Lock()
+        self._cache: "OrderedDict[str, tuple]" = OrderedDict()
+        self._in_flight: Dict[str, Future] = {}
+        self._stats: Dict[str, ToolStats] = {}
+
+    def register(
+        self,
+        tool: BaseTool,
+        ttl_seconds: Optional[float] = None,
+        key_fn: Optional[Callable[[Dict[str, Any]], Any]] = None,
+    ) -> StructuredTool:
+        """Return a cached, single-flight version of ``tool``.
+
+        ``key_fn`` maps the call arguments to the value that identifies a
+        result, e.g. a lower-cased query for a case-insensitive lookup.
+        ``ttl_seconds`` of None uses the registry default.
+        """
+        ttl = self.default_ttl_seconds if ttl_seconds is None else ttl_seconds
+        stats = self._stats.setdefault(tool.name, ToolStats())
+
+        def cache_key(kwargs: Dict[str, Any]) -> str:
+            value = key_fn(kwargs) if key_fn else kwargs
+            return tool.name + "\x00" + json.dumps(value, sort_keys=True, default=str)
+
+        def run_sync(**kwargs: Any) -> Any:
+            key = cache_key(kwargs)
+            while True:
+                future, owner = self._claim(key, stats)
+                if owner:
+                    return self._complete(key, future, stats, ttl, lambda: tool.func(**kwargs))
+                try:
+                    return future.result()
+                except _Abandoned:
+                    continue
+
+        async def run_async(**kwargs: Any) -> Any:
+            key = cache_key(kwargs)
+            while True:
+                future, owner = self._claim(key, stats)
+                if owner:
+                    break
+                try:
+                    # Shielded so that cancelling one waiter leaves the shared call running.
+                    return await asyncio.shield(asyncio.wrap_future(future))
+                except _Abandoned:
+                    continue
+            if tool.coroutine is not None:
+                started = time.perf_counter()
+                try:
+                    result = await tool.coroutine(**kwargs)
+                except BaseException as e:
+                    self._finish(key, future, stats, ttl, started, error=e)
+                    raise
+                return self._finish(key, future, stats, ttl, started, result=result)
+            # Sync tools run in a worker thread so they do not block the loop.
+            return await asyncio.get_running_loop().run_in_executor(
+                self.executor, lambda: self._complete(key, future, stats, ttl, lambda: tool.func(**kwargs))
+            )
+
+        return StructuredTool.from_function(
+            func=run_sync if tool.func is not None else None,
+            coroutine=run_async,
+            name=tool.name,
+            description=tool.description,
+            args_schema=tool.args_schema,
+            return_direct=tool.return_direct,
+        )
+
+    def _claim(self, key: str, stats: ToolStats) -> tuple:
+        """Return ``(future, owner)``; the owner must run the tool and resolve the future."""
+        now = time.monotonic()
+        with self._lock:
+            stats.calls += 1
+            entry = self._cache.get(key)
+            if entry is not None:
+                expires_at, result = entry
+                if expires_at is None or expires_at > now:
+                    self._cache.move_to_end(key)
+                    stats.cache_hits += 1
+                    future = Future()
+                    future.set_result(result)
+                    return future, False
+                del self._cache[key]
+            if key in self._in_flight:
+                stats.coalesced += 1
+                return self._in_flight[key], False
+            future = Future()
+            self._in_flight[key] = future
+            stats.executions += 1
+            return future, True
+
+    def _complete(self, key: str, future: Future, stats: ToolStats, ttl: Optional[float], call: Callable[[], Any]) -> Any:
+        started = time.perf_counter()
+        try:
+            result = call()
+        except BaseException as e:
+            self._finish(key, future, stats, ttl, started, error=e)
+            raise
+        return self._finish(key, future, stats, ttl, started, result=result)
+
+    def _finish(self, key: str, future: Future, stats: ToolStats, ttl: Optional[float], started: float,
+                result: Any = None, error: Optional[BaseException] = None) -> Any:
+        """Release the in-flight slot for ``key`` and resolve the shared future."""
+        try:
+            with self._lock:
+                stats.total_execution_seconds += time.perf_counter() - started
+                if error is not None:
+                    stats.errors += 1
+                elif ttl is None or ttl > 0:
+                    self._cache[key] = (None if ttl is None else time.monotonic() + ttl, result)
+                    self._cache.move_to_end(key)
+                    while len(self._cache) > self.max_entries:
+                        self._cache.popitem(last=False)
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+            if error is None:
+                future.set_result(result)
+            elif isinstance(error, Exception):
+                future.set_exception(error)
+            else:
+                # The owner was cancelled or interrupted; waiters retry instead of failing with it.
+                future.set_exception(_Abandoned(key))
+        return result
+
+    def clear(self) -> None:
+        """Drop every cached result."""
+        with self._lock:
+            self._cache.clear()
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-tool call, cache-hit and coalescing counters."""
+        with self._lock:
+            return {name: stats.as_dict() for name, stats in self._stats.items()}
@@ -0,0 +1,212 @@
+"""
+Warm Code Executor - Local ADK code executor backed by a pool of pre-warmed Python workers
+"""
+
+import json
+import queue
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.code_executors import BaseCodeExecutor
+from google.adk.code_executors.code_execution_utils import CodeExecutionInput, CodeExecutionResult
+from pydantic import Field, PrivateAttr
+
+# Worker loop run in each child interpreter. It reads one JSON request per
+# line, runs the code in fresh globals with stdout/stderr captured, and writes
+# one JSON response per line on a private copy of the original stdout. CPU
+# time per run is limited with a SIGPROF timer so the worker survives a
+# runaway loop; address space is capped once for the whole process.
+_WORKER = r"""
+import io, json, os, resource, signal, sys, traceback, contextlib
+import math, statistics, fractions, decimal, itertools, functools, collections, random, re
+
+memory_bytes, cpu_seconds, max_output = int(sys.argv[1]), float(sys.argv[2]), int(sys.argv[3])
+if memory_bytes > 0:
+    resource.setrlimit(resource.RLIMIT_AS, (memory_bytes, memory_bytes))
+
+protocol = os.fdopen(os.dup(1), "w", encoding="utf-8")
+devnull = os.open(os.devnull, os.O_WRONLY)
+os.dup2(devnull, 1)
+os.dup2(devnull, 2)
+
+class CpuTimeExceeded(BaseException):
+    pass
+
+def on_cpu_limit(signum, frame):
+    raise CpuTimeExceeded()
+
+signal.signal(signal.SIGPROF, on_cpu_limit)
+protocol.write("ready\n")
+protocol.flush()
+
+for line in sys.stdin:
+    code = json.loads(line)["code"]
+    stdout, stderr = io.StringIO(), io.StringIO()
+    signal.setitimer(signal.ITIMER_PROF, cpu_seconds)
+    try:
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+            exec(compile(code, "<code>", "exec"), {"__name__": "__main__"})
+    except CpuTimeExceeded:
+        stderr.write(f"Code execution exceeded the CPU time limit of {cpu_seconds} seconds.\n")
+    except MemoryError:
+        stderr.write("Code execution exceeded the memory limit.\n")
+    except SystemExit as exc:
+        if exc.code not in (None, 0):
+            stderr.write(f"Code execution exited with status {exc.code}.\n")
+    except BaseException as exc:
+        tb = exc.__traceback__
+        traceback.print_exception(type(exc), exc, tb.tb_next if tb else None, file=stderr)
+    finally:
+        signal.setitimer(signal.ITIMER_PROF, 0)
+    protocol.write(json.dumps({"stdout": stdout.getvalue()[:max_output], "stderr": stderr.getvalue()[:max_output]}) + "\n")
+    protocol.flush()
+"""
+
+
+class _Worker:
+    """One warm child interpreter and the number of runs it has served."""
+
+    def __init__(self, memory_bytes: int, cpu_seconds: float, max_output: int):
+        self.workdir = tempfile.TemporaryDirectory()
+        self.process = subprocess.Popen(
+            [sys.executable, "-I", "-c", _WORKER, str(memory_bytes), str(cpu_seconds), str(max_output)],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            encoding="utf-8",
+            cwd=self.workdir.name,
+            env={"PYTHONIOENCODING": "utf-8"},
+            start_new_session=True,
+        )
+        self.runs = 0
+        # Block until the imports are done so the worker is warm when pooled.
+        if self.process.stdout.readline().strip() != "ready":
+            self.close()
+            raise RuntimeError("Code worker failed to start.")
+
+    def run(self, code: str, wall_timeout: float) -> Dict[str, str]:
+        self.runs += 1
+        self.process.stdin.write(json.dumps({"code": code}) + "\n")
+        self.process.stdin.flush()
+        # CPU time is limited inside the worker; this catches code that blocks without using CPU.
+        response: Dict[str, Any] = {}
+        reader = threading.Thread(target=lambda: response.update(line=self.process.stdout.readline()), daemon=True)
+        reader.start()
+        reader.join(wall_timeout)
+        if reader.is_alive() or not response.get("line"):
+            raise TimeoutError if reader.is_alive() else RuntimeError("Code worker exited unexpectedly.")
+        return json.loads(response["line"])
+
+    def close(self) -> None:
+        if self.process.poll() is None:
+            self.process.kill()
+            self.process.wait()
+        self.workdir.cleanup()
+
+
+class LocalWarmCodeExecutor(BaseCodeExecutor):
+    """Runs model-generated Python locally on a pool of pre-warmed worker processes.
+
+    Workers are started ahead of time with the common standard-library math
+    modules already imported, so a short calculation costs one pipe round
+    trip instead of an interpreter start or a remote execution. Each run gets
+    fresh globals, captured stdout/stderr, a CPU time limit, and the worker's
+    memory cap. A worker is replaced after ``max_runs_per_worker`` runs, and
+    after any run that hangs or crashes it, so state leaked through imported
+    modules does not accumulate. This isolates runs from the agent process,
+    not from the host: use a container executor for untrusted code.
+    """
+
+    stateful: bool = Field(default=False, frozen=True, exclude=True)
+    optimize_data_file: bool = Field(default=False, frozen=True, exclude=True)
+
+    pool_size: int = 2
+    max_runs_per_worker: int = 50
+    cpu_timeout_seconds: float = 2.0
+    memory_limit_bytes: int = 256 * 1024 * 1024
+    max_output_chars: int = 10_000
+    worker_wait_seconds: float = 10.0
+
+    _idle: "queue.Queue[_Worker]" = PrivateAttr(default_factory=queue.Queue)
+    _lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+    _runs: int = PrivateAttr(default=0)
+    _recycled: int = PrivateAttr(default=0)
+    _timeouts: int = PrivateAttr(default=0)
+    _total_seconds: float = PrivateAttr(default=0.0)
+
+    def model_post_init(self, __context: Any) -> None:
+        super().model_post_init(__context)
+        for _ in range(self.pool_size):
+            self._idle.put(self._new_worker())
+
+    def _new_worker(self) -> _Worker:
+        return _Worker(self.memory_limit_bytes, self.cpu_timeout_seconds, self.max_output_chars)
+
+    def _replace_in_background(self) -> None:
+        threading.Thread(target=self._refill, daemon=True).start()
+
+    def _refill(self, attempts: int = 3) -> None:
+        # Retry a failed start with backoff; if every attempt fails the pool is one
+        # worker short until execute_code starts one itself.
+        for attempt in range(attempts):
+            try:
+                self._idle.put(self._new_worker())
+                return
+            except Exception:
+                time.sleep(0.5 * 2 ** attempt)
+
+    def execute_code(
+        self,
+        invocation_context: Optional[InvocationContext],
+        code_execution_input: CodeExecutionInput,
+    ) -> CodeExecutionResult:
+        started = time.perf_counter()
+        try:
+            worker = self._idle.get(timeout=self.worker_wait_seconds)
+        except queue.Empty:
+            # Replacement workers failed to start; start one here, raising if that fails too.
+            worker = self._new_worker()
+        recycle = False
+        try:
+            result = worker.run(code_execution_input.code, wall_timeout=self.cpu_timeout_seconds * 2 + 1)
+        except TimeoutError:
+            recycle = True
+            with self._lock:
+                self._timeouts += 1
+            result = {"stdout": "", "stderr": f"Code execution timed out after {self.cpu_timeout_seconds * 2 + 1} seconds."}
+        except RuntimeError as e:
+            recycle = True
+            result = {"stdout": "", "stderr": str(e)}
+
+        if recycle or worker.runs >= self.max_runs_per_worker:
+            worker.close()
+            with self._lock:
+                self._recycled += 1
+            self._replace_in_background()
+        else:
+            self._idle.put(worker)
+
+        with self._lock:
+            self._runs += 1
+            self._total_seconds += time.perf_counter() - started
+        return CodeExecutionResult(stdout=result["stdout"], stderr=result["stderr"], output_files=[])
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "runs": self._runs,
+                "recycled_workers": self._recycled,
+                "timeouts": self._timeouts,
+                "avg_execution_ms": self._total_seconds / self._runs * 1000 if self._runs else 0.0,
+                "idle_workers": self._idle.qsize(),
+            }
+
+    def close(self) -> None:
+        """Stop the idle workers."""
+        while not self._idle.empty():
+            self._idle.get_nowait().close()
@@ -1,10 +1,25 @@
 import os
+from typing import Dict, Optional
 from crewai import Agent, Task, Crew, LLM, Process
 from crewai.tools import tool
 from dotenv import load_dotenv
+from plan_cache import PlanCache
+from plan_dag import DagExecutor, DocumentPlan, PlanStep, topological_order
 
 load_dotenv()
 api_key = os.getenv("GEMINI_API_KEY")
+# Plan into a dependency graph of sections and write independent sections concurrently
+USE_DAG_PLANNING = False
+MAX_PARALLEL_SECTIONS = 4
+# DAG planning mode only: plans for similar earlier topics are reused instead of
+# planning again. The cache is opened on first use, so the default flow never touches it.
+_plan_cache: Optional[PlanCache] = None
+
+def get_plan_cache() -> PlanCache:
+    global _plan_cache
+    if _plan_cache is None:
+        _plan_cache = PlanCache("plan_cache.db", threshold=0.6, max_entries=1_000)
+    return _plan_cache
 
 # Configure Gemini LLM
 def setup_gemini_llm():
@@ -58,6 +73,80 @@ crew = Crew(
     verbose=True # Set to False for less detailed logs in production
 )
 
+# --- DAG planning mode ---
+# The planner returns sections with explicit dependencies, independent
+# sections are written concurrently, and a final task assembles them, so the
+# time taken follows the longest dependency chain, not the number of sections.
+
+def make_plan(topic: str) -> DocumentPlan:
+    cached = get_plan_cache().get(topic)
+    if cached is not None:
+        plan, cached_topic, similarity = cached
+        print(f"\nReusing the plan for '{cached_topic}' (similarity {similarity:.2f})")
+        return plan
+    planning_task = Task(
+        description=(
+            f"Create a plan for a document on the topic: '{topic}'.\n"
+            "Split it into sections. For each section give a short unique id, a title, "
+            "instructions on what it must cover, and depends_on: the ids of the sections "
+            "whose content it needs (for example, a conclusion depends on the sections it concludes). "
+            "Leave depends_on empty for sections that can be written independently."
+        ),
+        expected_output="A plan with one step per section, including the dependencies between sections.",
+        output_pydantic=DocumentPlan,
+        agent=planner_writer_agent,
+    )
+    result = Crew(agents=[planner_writer_agent], tasks=[planning_task], verbose=False).kickoff()
+    plan = result.pydantic
+    if not isinstance(plan, DocumentPlan) or not plan.steps:
+        raise ValueError(f"The planner did not return a valid plan: {result.raw!r}")
+    # Raises for duplicate ids, unknown dependencies and cycles, so a broken plan is never cached.
+    topological_order(plan)
+    get_plan_cache().put(topic, plan)
+    return plan
+
+def write_section(step: PlanStep, dependency_outputs: Dict[str, str]) -> str:
+    """Write one section; runs on a worker thread with its own Crew and agent."""
+    # CrewAI keeps per-run state on the agent, so concurrent sections must not share one.
+    section_writer = planner_writer_agent.copy()
+    context = "\n\n".join(f"Section '{dep}':\n{text}" for dep, text in dependency_outputs.items())
+    section_task = Task(
+        description=(
+            f"Write the section '{step.title}' of a document on '{topic}'.\n"
+            f"It must cover: {step.instructions}\n"
+            + (f"\nBuild on these sections, without repeating them:\n{context}" if context else "")
+        ),
+        expected_output=f"The text of the section '{step.title}', without a heading.",
+        agent=section_writer,
+    )
+    return Crew(agents=[section_writer], tasks=[section_task], verbose=False).kickoff().raw
+
+def assemble(plan: DocumentPlan, sections: Dict[str, str]) -> str:
+    drafts = "\n\n".join(f"### {step.title}\n{sections[step.id]}" for step in plan.steps)
+    assembly_task = Task(
+        description=(
+            f"Merge these sections into one coherent document on '{topic}'. "
+            f"Keep their order, smooth the transitions and remove repetition.\n\n{drafts}"
+        ),
+        expected_output=(
+            "A final report containing two distinct sections:\n\n"
+            "### Plan\n"
+            "- A bulleted list of the section titles.\n\n"
+            "### Summary\n"
+            "- The merged document."
+        ),
+        agent=planner_writer_agent,
+    )
+    return Crew(agents=[planner_writer_agent], tasks=[assembly_task], verbose=False).kickoff().raw
+
+def run_dag_planning() -> str:
+    plan = make_plan(topic)
+    executor = DagExecutor(write_section, max_workers=MAX_PARALLEL_SECTIONS)
+    sections = executor.execute(plan)
+    print(f"\nPlan execution: {executor.report()}")
+    print(f"Plan cache: {get_plan_cache().stats()}")
+    return assemble(plan, sections)
+
 def main():
     """Main function to run the crew."""
     try:
@@ -70,7 +159,7 @@ def main():
         print("\n## Starting the Financial Crew with Gemini LLM...")
         print("---------------------------------")
         # The kickoff method starts the execution.
-        result = crew.kickoff()
+        result = run_dag_planning() if USE_DAG_PLANNING else crew.kickoff()
         print("\n---------------------------------")
         print("## Crew execution finished.")
         print("\nFinal Result:\n", result)
@@ -0,0 +1,167 @@
+"""
+Plan Cache - Persistent plan store with similarity lookup by topic shingles
+"""
+
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, FrozenSet, Optional, Tuple
+
+from plan_dag import DocumentPlan
+
+STOPWORDS = {
+    "a", "an", "the", "of", "in", "on", "for", "to", "and", "or", "with", "about",
+    "is", "are", "its", "how", "what", "why", "role", "importance",
+}
+
+
+def topic_shingles(topic: str) -> FrozenSet[str]:
+    """Content words and adjacent word pairs of a topic, lower case, stopwords removed."""
+    words = [word for word in re.findall(r"[a-z0-9]+", topic.lower()) if word not in STOPWORDS]
+    # Plain plural folding so "agents" and "agent" match.
+    words = [word[:-1] if len(word) > 3 and word.endswith("s") and not word.endswith("ss") else word for word in words]
+    return frozenset(words + [f"{a} {b}" for a, b in zip(words, words[1:])])
+
+
+def jaccard(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+def adapt_plan(plan: DocumentPlan, cached_topic: str, topic: str) -> DocumentPlan:
+    """Point a plan made for ``cached_topic`` at ``topic`` by rewriting mentions of the old topic."""
+    if cached_topic.strip().lower() == topic.strip().lower():
+        return plan
+    pattern = re.compile(re.escape(cached_topic.strip()), re.IGNORECASE)
+    return DocumentPlan(steps=[
+        step.model_copy(update={
+            "title": pattern.sub(topic.strip(), step.title),
+            "instructions": pattern.sub(topic.strip(), step.instructions),
+        })
+        for step in plan.steps
+    ])
+
+
+class PlanCache:
+    """SQLite backed store of plans, looked up by topic similarity.
+
+    A lookup returns the stored plan whose topic has the highest Jaccard
+    similarity of word shingles with the requested topic, if it reaches
+    ``threshold``; an exact topic match always has similarity 1. Shingles of
+    every stored topic are kept in memory, so a lookup is one scan over a few
+    thousand small sets and only the matching plan is read from disk. The
+    least recently used plans are evicted beyond ``max_entries``, and plans
+    older than ``ttl_seconds`` are ignored and removed.
+    """
+
+    def __init__(
+        self,
+        database_path: str = "plan_cache.db",
+        threshold: float = 0.6,
+        max_entries: int = 1_000,
+        ttl_seconds: Optional[float] = None,
+    ):
+        self.database_path = database_path
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.exact_hits = 0
+        self.similar_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(database_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS plans (
+                topic TEXT PRIMARY KEY,
+                plan TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )"""
+        )
+        self._conn.commit()
+        # topic -> (shingles, created_at)
+        self._index: Dict[str, Tuple[FrozenSet[str], float]] = {
+            topic: (topic_shingles(topic), created_at)
+            for topic, created_at in self._conn.execute("SELECT topic, created_at FROM plans")
+        }
+
+    @staticmethod
+    def _normalize(topic: str) -> str:
+        return re.sub(r"\s+", " ", topic.strip().lower())
+
+    def _drop(self, topics) -> None:
+        self._conn.executemany("DELETE FROM plans WHERE topic = ?", [(topic,) for topic in topics])
+        for topic in topics:
+            self._index.pop(topic, None)
+        self.evictions += len(topics)
+
+    def get(self, topic: str, adapt: bool = True) -> Optional[Tuple[DocumentPlan, str, float]]:
+        """Return ``(plan, cached_topic, similarity)`` for the most similar stored topic, or None."""
+        key = self._normalize(topic)
+        shingles = topic_shingles(key)
+        now = time.time()
+        with self._lock:
+            if self.ttl_seconds is not None:
+                expired = [t for t, (_, created_at) in self._index.items() if now - created_at > self.ttl_seconds]
+                if expired:
+                    self._drop(expired)
+                    self._conn.commit()
+            best_topic, best_score = None, 0.0
+            for cached_topic, (cached_shingles, _) in self._index.items():
+                score = 1.0 if cached_topic == key else jaccard(shingles, cached_shingles)
+                if score > best_score:
+                    best_topic, best_score = cached_topic, score
+            if best_topic is None or best_score < self.threshold:
+                self.misses += 1
+                return None
+            row = self._conn.execute("SELECT plan FROM plans WHERE topic = ?", (best_topic,)).fetchone()
+            self._conn.execute("UPDATE plans SET last_access = ? WHERE topic = ?", (now, best_topic))
+            self._conn.commit()
+            if best_topic == key:
+                self.exact_hits += 1
+            else:
+                self.similar_hits += 1
+        plan = DocumentPlan.model_validate_json(row[0])
+        if adapt:
+            plan = adapt_plan(plan, best_topic, topic)
+        return plan, best_topic, best_score
+
+    def put(self, topic: str, plan: DocumentPlan) -> None:
+        """Store the plan for a topic and evict the least recently used plans."""
+        key = self._normalize(topic)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO plans (topic, plan, created_at, last_access) VALUES (?, ?, ?, ?)",
+                (key, plan.model_dump_json(), now, now),
+            )
+            self._index[key] = (topic_shingles(key), now)
+            overflow = len(self._index) - self.max_entries
+            if overflow > 0:
+                oldest = [row[0] for row in self._conn.execute(
+                    "SELECT topic FROM plans ORDER BY last_access ASC LIMIT ?", (overflow,)
+                )]
+                self._drop(oldest)
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters for the lifetime of this cache object."""
+        hits = self.exact_hits + self.similar_hits
+        lookups = hits + self.misses
+        return {
+            "exact_hits": self.exact_hits,
+            "similar_hits": self.similar_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self._index),
+            "hit_rate": hits / lookups if lookups else 0.0,
+        }
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
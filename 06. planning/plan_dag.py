@@ -0,0 +1,117 @@
+"""
+Plan DAG - Run the steps of a plan as a dependency graph on a bounded worker pool
+"""
+
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, Dict, List
+
+from pydantic import BaseModel, Field
+
+
+class PlanStep(BaseModel):
+    id: str = Field(description="Short unique identifier of the step, e.g. 'intro'")
+    title: str = Field(description="Section title")
+    instructions: str = Field(description="What this section must cover")
+    depends_on: List[str] = Field(
+        default_factory=list,
+        description="Ids of the steps whose content this step needs; empty if it can be written independently",
+    )
+
+
+class DocumentPlan(BaseModel):
+    steps: List[PlanStep]
+
+
+def topological_order(plan: DocumentPlan) -> List[PlanStep]:
+    """Return the steps so that every step follows its dependencies.
+
+    Raises ValueError for duplicate ids, unknown dependencies or cycles.
+    """
+    steps = {step.id: step for step in plan.steps}
+    if len(steps) != len(plan.steps):
+        raise ValueError("Plan step ids must be unique.")
+    for step in plan.steps:
+        unknown = [dep for dep in step.depends_on if dep not in steps]
+        if unknown:
+            raise ValueError(f"Step '{step.id}' depends on unknown steps: {unknown}")
+    ordered, done = [], set()
+    remaining = list(plan.steps)
+    while remaining:
+        ready = [step for step in remaining if all(dep in done for dep in step.depends_on)]
+        if not ready:
+            raise ValueError(f"Plan has a dependency cycle among: {[step.id for step in remaining]}")
+        for step in ready:
+            ordered.append(step)
+            done.add(step.id)
+        remaining = [step for step in remaining if step.id not in done]
+    return ordered
+
+
+class DagExecutor:
+    """Runs plan steps concurrently as soon as their dependencies are done.
+
+    ``run_step(step, dependency_outputs)`` produces the output of one step;
+    it receives the outputs of the steps it depends on. At most
+    ``max_workers`` steps run at once. ``report()`` compares the wall-clock
+    time with the serial sum of step times and with the critical path, the
+    lower bound for any amount of concurrency.
+    """
+
+    def __init__(self, run_step: Callable[[PlanStep, Dict[str, str]], str], max_workers: int = 4):
+        self.run_step = run_step
+        self.max_workers = max_workers
+        self.durations: Dict[str, float] = {}
+        self.wall_seconds = 0.0
+        self._plan: DocumentPlan = DocumentPlan(steps=[])
+
+    def _timed(self, step: PlanStep, inputs: Dict[str, str]) -> str:
+        started = time.perf_counter()
+        try:
+            return self.run_step(step, inputs)
+        finally:
+            self.durations[step.id] = time.perf_counter() - started
+
+    def execute(self, plan: DocumentPlan) -> Dict[str, str]:
+        """Run every step and return ``{step id: output}``; the first failing step's error is raised."""
+        topological_order(plan)
+        self._plan = plan
+        outputs: Dict[str, str] = {}
+        pending = list(plan.steps)
+        running: Dict[Future, PlanStep] = {}
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="plan-step") as pool:
+            while pending or running:
+                ready = [step for step in pending if all(dep in outputs for dep in step.depends_on)]
+                for step in ready:
+                    pending.remove(step)
+                    inputs = {dep: outputs[dep] for dep in step.depends_on}
+                    running[pool.submit(self._timed, step, inputs)] = step
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    step = running.pop(future)
+                    try:
+                        outputs[step.id] = future.result()
+                    except Exception:
+                        for other in running:
+                            other.cancel()
+                        raise
+        self.wall_seconds = time.perf_counter() - started
+        return outputs
+
+    def critical_path_seconds(self) -> float:
+        finish: Dict[str, float] = {}
+        for step in topological_order(self._plan):
+            start = max((finish[dep] for dep in step.depends_on), default=0.0)
+            finish[step.id] = start + self.durations.get(step.id, 0.0)
+        return max(finish.values(), default=0.0)
+
+    def report(self) -> Dict[str, float]:
+        serial = sum(self.durations.values())
+        return {
+            "steps": len(self.durations),
+            "wall_seconds": self.wall_seconds,
+            "serial_seconds": serial,
+            "critical_path_seconds": self.critical_path_seconds(),
+            "speedup": serial / self.wall_seconds if self.wall_seconds else 0.0,
+        }
@@ -1,6 +1,5 @@
 from google.adk.agents import Agent, LlmAgent
 from google.adk.agents.invocation_context import InvocationContext
-from google.adk.sessions import InMemorySessionService
 from google.adk.runners import Runner
 
 from google.adk.tools import agent_tool
@@ -8,12 +7,15 @@ from google.genai import types
 import nest_asyncio
 import asyncio
 from dotenv import load_dotenv
+from sqlite_session_service import WriteBehindSQLiteSessionService
 load_dotenv()
 
 # Define variables required for Session setup and Agent execution
 APP_NAME="Google Search_agent"
 USER_ID="user1234"
 SESSION_ID="1234"
+# Sessions, events and state are stored in SQLite and survive restarts
+session_service = WriteBehindSQLiteSessionService("layered_sessions.db")
 
 def generate_image(prompt: str) -> dict:
     print(f"TOOL: Generating image for prompt: '{prompt}'")
@@ -57,8 +59,10 @@ tools=[image_tool]
 )
 
 async def call_agent(query):
-    session_service = InMemorySessionService()
-    session = await session_service.create_session(app_name=APP_NAME, user_id=USER_ID, session_id=SESSION_ID)
+    # The session outlives the process, so continue it if it already exists.
+    session = await session_service.get_session(app_name=APP_NAME, user_id=USER_ID, session_id=SESSION_ID)
+    if session is None:
+        session = await session_service.create_session(app_name=APP_NAME, user_id=USER_ID, session_id=SESSION_ID)
     runner = Runner(agent=artist_agent, app_name=APP_NAME, session_service=session_service)
 
     content = types.Content(role='user', parts=[types.Part(text=query)])
@@ -71,6 +75,8 @@ async def call_agent(query):
                 author = getattr(event, 'author', 'Unknown')
                 print(f"{author}: {response}")
                 print("---")
+    # Wait for the write-behind flusher before the process exits.
+    await session_service.flush()
 
 nest_asyncio.apply()
 asyncio.run(call_agent(""))
\ No newline at end of file
@@ -1,6 +1,5 @@
 from google.adk.agents import Agent, ParallelAgent
 from google.adk.agents.invocation_context import InvocationContext
-from google.adk.sessions import InMemorySessionService
 from google.adk.runners import Runner
 
 from google.adk.events import Event
@@ -9,12 +8,15 @@ from google.genai import types
 import nest_asyncio
 import asyncio
 from dotenv import load_dotenv
+from sqlite_session_service import WriteBehindSQLiteSessionService
 load_dotenv()
 
 # Define variables required for Session setup and Agent execution
 APP_NAME="Google Search_agent"
 USER_ID="user1234"
 SESSION_ID="1234"
+# Sessions, events and state are stored in SQLite and survive restarts
+session_service = WriteBehindSQLiteSessionService("parallel_sessions.db")
 
 weather_fetcher = Agent(
     name="weather_fetcher",
@@ -38,8 +40,10 @@ data_gatherer = ParallelAgent(
 )
 
 async def call_agent(query):
-    session_service = InMemorySessionService()
-    session = await session_service.create_session(app_name=APP_NAME, user_id=USER_ID, session_id=SESSION_ID)
+    # The session outlives the process, so continue it if it already exists.
+    session = await session_service.get_session(app_name=APP_NAME, user_id=USER_ID, session_id=SESSION_ID)
+    if session is None:
+        session = await session_service.create_session(app_name=APP_NAME, user_id=USER_ID, session_id=SESSION_ID)
     runner = Runner(agent=data_gatherer, app_name=APP_NAME, session_service=session_service)
 
     content = types.Content(role='user', parts=[types.Part(text=query)])
@@ -52,6 +56,8 @@ async def call_agent(query):
                 author = getattr(event, 'author', 'Unknown')
                 print(f"{author}: {response}")
                 print("---")
+    # Wait for the write-behind flusher before the process exits.
+    await session_service.flush()
 
 nest_asyncio.apply()
 asyncio.run(call_agent("London"))
\ No newline at end of file
@@ -1,6 +1,5 @@
 from google.adk.agents import Agent, SequentialAgent
 from google.adk.agents.invocation_context import InvocationContext
-from google.adk.sessions import InMemorySessionService
 from google.adk.runners import Runner
 
 from google.adk.events import Event
@@ -9,12 +8,18 @@ from google.genai import types
 import nest_asyncio
 import asyncio
 from dotenv import load_dotenv
+from sqlite_session_service import WriteBehindSQLiteSessionService
+from pipelined_runner import PipelinedRunner
 load_dotenv()
 
 # Define variables required for Session setup and Agent execution
 APP_NAME="Google Search_agent"
 USER_ID="user1234"
 SESSION_ID="1234"
+# Sessions, events and state are stored in SQLite and survive restarts
+session_service = WriteBehindSQLiteSessionService("sequential_sessions.db")
+# Stream several queries through the pipeline with its stages overlapped
+USE_PIPELINED_RUNNER = True
 
 # This agent's output will be saved to session.state["data"]
 step1 = Agent(
@@ -36,8 +41,10 @@ pipeline = SequentialAgent(
 )
 
 async def call_agent(query):
-    session_service = InMemorySessionService()
-    session = await session_service.create_session(app_name=APP_NAME, user_id=USER_ID, session_id=SESSION_ID)
+    # The session outlives the process, so continue it if it already exists.
+    session = await session_service.get_session(app_name=APP_NAME, user_id=USER_ID, session_id=SESSION_ID)
+    if session is None:
+        session = await session_service.create_session(app_name=APP_NAME, user_id=USER_ID, session_id=SESSION_ID)
     runner = Runner(agent=pipeline, app_name=APP_NAME, session_service=session_service)
 
     content = types.Content(role='user', parts=[types.Part(text=query)])
@@ -50,6 +57,32 @@ async def call_agent(query):
                 author = getattr(event, 'author', 'Unknown')
                 print(f"{author}: {response}")
                 print("---")
+    # Wait for the write-behind flusher before the process exits.
+    await session_service.flush()
+
+async def call_agent_pipelined(queries):
+    # Each query gets its own session; query n+1 runs Step1_Fetch while query n runs Step2_Process.
+    pipelined = PipelinedRunner(pipeline, app_name=APP_NAME, user_id=USER_ID, workers_per_stage=1,
+                                session_service=session_service)
+    results = await pipelined.run_many(queries)
+    for result in results:
+        print(f"Query: {result.query} (latency {result.latency:.2f}s)")
+        for event in result.events:
+            if event.content and event.content.parts:
+                print(f"{event.author}: {event.content.parts[0].text}")
+        print("---")
+    print(f"Pipeline report: {pipelined.report()}")
+    await pipelined.close()
+    await session_service.flush()
+    print(f"Session store: {session_service.stats()}")
 
 nest_asyncio.apply()
-asyncio.run(call_agent("Tell me what is 5 + 5"))
\ No newline at end of file
+if USE_PIPELINED_RUNNER:
+    asyncio.run(call_agent_pipelined([
+        "Tell me what is 5 + 5",
+        "Tell me what is 12 * 3",
+        "Tell me what is 100 - 58",
+        "Tell me what is 7 squared",
+    ]))
+else:
+    asyncio.run(call_agent("Tell me what is 5 + 5"))
\ No newline at end of file
@@ -0,0 +1,159 @@
+"""
+Pipelined Runner - Overlap the stages of a SequentialAgent across a stream of queries
+"""
+
+import asyncio
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, AsyncGenerator, Dict, List, Optional, Sequence
+
+from google.adk.agents import BaseAgent, SequentialAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event
+from google.adk.runners import Runner
+from google.adk.sessions import BaseSessionService, InMemorySessionService
+from google.genai import types
+from pydantic import PrivateAttr
+
+
+@dataclass
+class StageStats:
+    runs: int = 0
+    total_wait: float = 0.0
+    total_service: float = 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "runs": self.runs,
+            "avg_wait_seconds": self.total_wait / self.runs if self.runs else 0.0,
+            "avg_service_seconds": self.total_service / self.runs if self.runs else 0.0,
+        }
+
+
+class PipelinedSequentialAgent(BaseAgent):
+    """Runs its sub-agents in order like SequentialAgent, with a bounded pool per stage.
+
+    Each stage admits at most ``workers_per_stage`` invocations at a time;
+    the others wait in that stage's queue. With one invocation per query,
+    query n+1 can be in stage 1 while query n is in stage 2, so steady-state
+    throughput is set by the slowest stage rather than the sum of stages.
+    Every invocation keeps its own session, so state never mixes.
+    """
+
+    workers_per_stage: int = 1
+
+    _gates: Dict[str, asyncio.Semaphore] = PrivateAttr(default_factory=dict)
+    _stats: Dict[str, StageStats] = PrivateAttr(default_factory=dict)
+
+    @classmethod
+    def from_sequential(cls, agent: SequentialAgent, workers_per_stage: int = 1) -> "PipelinedSequentialAgent":
+        """Build a pipelined copy of a SequentialAgent; the original is left untouched."""
+        return cls(
+            name=agent.name,
+            description=agent.description,
+            sub_agents=[sub_agent.clone() for sub_agent in agent.sub_agents],
+            workers_per_stage=workers_per_stage,
+        )
+
+    def stage_stats(self) -> Dict[str, Dict[str, Any]]:
+        return {name: stats.as_dict() for name, stats in self._stats.items()}
+
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        for sub_agent in self.sub_agents:
+            gate = self._gates.setdefault(sub_agent.name, asyncio.Semaphore(self.workers_per_stage))
+            stats = self._stats.setdefault(sub_agent.name, StageStats())
+            enqueued = time.perf_counter()
+            async with gate:
+                started = time.perf_counter()
+                stats.total_wait += started - enqueued
+                try:
+                    async for event in sub_agent.run_async(ctx):
+                        yield event
+                finally:
+                    stats.runs += 1
+                    stats.total_service += time.perf_counter() - started
+
+
+@dataclass
+class PipelineResult:
+    query: str
+    session_id: str
+    events: List[Event] = field(default_factory=list)
+    state: Dict[str, Any] = field(default_factory=dict)
+    latency: float = 0.0
+
+
+class PipelinedRunner:
+    """Streams many queries through a SequentialAgent with its stages overlapped.
+
+    Each query runs in a fresh session on one shared Runner; the stage
+    queues of the wrapped agent decide how far the queries overlap. The
+    session is deleted once its state is copied into the result, so a
+    persistent session service does not grow by one session per query;
+    pass ``delete_sessions=False`` to keep them.
+    """
+
+    def __init__(
+        self,
+        agent: SequentialAgent,
+        app_name: str,
+        user_id: str = "user1234",
+        workers_per_stage: int = 1,
+        session_service: Optional[BaseSessionService] = None,
+        delete_sessions: bool = True,
+    ):
+        self.agent = PipelinedSequentialAgent.from_sequential(agent, workers_per_stage)
+        self.app_name = app_name
+        self.user_id = user_id
+        self.session_service = session_service or InMemorySessionService()
+        self.delete_sessions = delete_sessions
+        self.runner = Runner(agent=self.agent, app_name=app_name, session_service=self.session_service)
+        self.completed = 0
+        self.elapsed = 0.0
+
+    async def run(self, query: str) -> PipelineResult:
+        """Run one query through every stage in its own session."""
+        started = time.perf_counter()
+        session_id = str(uuid.uuid4())
+        await self.session_service.create_session(app_name=self.app_name, user_id=self.user_id, session_id=session_id)
+        result = PipelineResult(query=query, session_id=session_id)
+        try:
+            async for event in self.runner.run_async(
+                user_id=self.user_id,
+                session_id=session_id,
+                new_message=types.Content(role='user', parts=[types.Part(text=query)]),
+            ):
+                result.events.append(event)
+            session = await self.session_service.get_session(app_name=self.app_name, user_id=self.user_id, session_id=session_id)
+            result.state = dict(session.state) if session else {}
+        finally:
+            if self.delete_sessions:
+                await self.session_service.delete_session(app_name=self.app_name, user_id=self.user_id, session_id=session_id)
+        result.latency = time.perf_counter() - started
+        self.completed += 1
+        return result
+
+    async def run_many(self, queries: Sequence[str]) -> List[PipelineResult]:
+        """Run all queries with their stages overlapped; results are in query order."""
+        started = time.perf_counter()
+        results = await asyncio.gather(*(self.run(query) for query in queries))
+        self.elapsed += time.perf_counter() - started
+        return list(results)
+
+    def report(self) -> Dict[str, Any]:
+        stages = self.agent.stage_stats()
+        slowest = max((stage["avg_service_seconds"] for stage in stages.values()), default=0.0)
+        stage_sum = sum(stage["avg_service_seconds"] for stage in stages.values())
+        workers = self.agent.workers_per_stage
+        return {
+            "completed": self.completed,
+            "throughput_per_second": self.completed / self.elapsed if self.elapsed else 0.0,
+            "pipelined_bound_per_second": workers / slowest if slowest else 0.0,
+            # One query at a time through every stage, as the plain SequentialAgent runs them
+            "serial_bound_per_second": 1 / stage_sum if stage_sum else 0.0,
+            "stages": stages,
+        }
+
+    async def close(self) -> None:
+        await self.runner.close()
@@ -0,0 +1,483 @@
+"""
+SQLite Session Service - Durable ADK session service with write-behind batching
+"""
+
+import asyncio
+import json
+import logging
+import queue
+import sqlite3
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from google.adk.errors.already_exists_error import AlreadyExistsError
+from google.adk.errors.session_not_found_error import SessionNotFoundError
+from google.adk.events import Event
+from google.adk.sessions import BaseSessionService, Session
+from google.adk.sessions.base_session_service import GetSessionConfig, ListSessionsResponse
+from google.adk.sessions.state import State
+
+logger = logging.getLogger(__name__)
+
+SessionKey = Tuple[str, str, str]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    app_name TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    id TEXT NOT NULL,
+    state TEXT NOT NULL,
+    last_update_time REAL NOT NULL,
+    PRIMARY KEY (app_name, user_id, id)
+);
+CREATE TABLE IF NOT EXISTS events (
+    app_name TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    session_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    event TEXT NOT NULL,
+    PRIMARY KEY (app_name, user_id, session_id, seq)
+);
+CREATE TABLE IF NOT EXISTS app_states (
+    app_name TEXT PRIMARY KEY,
+    state TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS user_states (
+    app_name TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    state TEXT NOT NULL,
+    PRIMARY KEY (app_name, user_id)
+);
+"""
+
+
+def _split_state(state: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any], Dict[str, Any]]:
+    """Split a state dict into (app, user, session) parts; temp: keys are dropped."""
+    app, user, session = {}, {}, {}
+    for key, value in state.items():
+        if key.startswith(State.APP_PREFIX):
+            app[key[len(State.APP_PREFIX):]] = value
+        elif key.startswith(State.USER_PREFIX):
+            user[key[len(State.USER_PREFIX):]] = value
+        elif not key.startswith(State.TEMP_PREFIX):
+            session[key] = value
+    return app, user, session
+
+
+@dataclass
+class _CachedSession:
+    session: Session
+    next_seq: int
+    pending_writes: int = 0
+
+
+class WriteBehindSQLiteSessionService(BaseSessionService):
+    """ADK session service that persists sessions, events and state to SQLite.
+
+    Reads are served from an LRU cache of recent sessions; a miss reads the
+    database on a worker thread. Writes update the cache immediately and are
+    queued for a background thread that commits them in batches, every
+    ``flush_interval_seconds`` or ``batch_size`` writes, so a burst of
+    ``append_event`` calls from thousands of sessions costs a few
+    transactions instead of one each. Within a batch only the last state
+    written for a session is stored. Sessions with unflushed writes are never
+    evicted from the cache, so reads always see them.
+
+    The state in the sessions table is the materialized result of every
+    event, so old events are not needed to rebuild it. Each session keeps its
+    ``max_events_per_session`` most recent events, in the database and in
+    the cache; older ones are compacted away.
+
+    Call ``flush()`` to wait for pending writes and ``close()`` at shutdown;
+    writes still queued when the process dies are lost, as with any
+    write-behind cache. A batch that fails to commit, e.g. because another
+    process holds the database lock, is logged and dropped, and the next
+    ``flush()`` raises its error.
+    """
+
+    def __init__(
+        self,
+        database_path: str = "sessions.db",
+        max_cached_sessions: int = 10_000,
+        max_events_per_session: int = 200,
+        flush_interval_seconds: float = 0.05,
+        batch_size: int = 500,
+    ):
+        self.database_path = database_path
+        self.max_cached_sessions = max_cached_sessions
+        self.max_events_per_session = max_events_per_session
+        self.flush_interval_seconds = flush_interval_seconds
+        self.batch_size = batch_size
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.flushed_batches = 0
+        self.flushed_writes = 0
+        self.failed_writes = 0
+        self.compacted_events = 0
+        # Guards the caches: the sync Runner.run drives this service from its own thread.
+        self._lock = threading.RLock()
+        self._sessions: "OrderedDict[SessionKey, _CachedSession]" = OrderedDict()
+        self._app_states: Dict[str, Dict[str, Any]] = {}
+        self._user_states: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._pending_deletes: Dict[SessionKey, int] = {}
+
+        writer = sqlite3.connect(database_path, check_same_thread=False)
+        writer.execute("PRAGMA journal_mode=WAL")
+        writer.execute("PRAGMA synchronous=NORMAL")
+        writer.executescript(_SCHEMA)
+        writer.commit()
+        # WAL lets this reader run while the flusher writes.
+        self._reader = sqlite3.connect(database_path, check_same_thread=False)
+        self._reader_lock = threading.Lock()
+        self._writes: "queue.Queue[tuple]" = queue.Queue()
+        self._flusher = threading.Thread(target=self._flush_loop, args=(writer,), name="session-flusher", daemon=True)
+        self._flusher.start()
+
+    # --- Cache helpers ---
+
+    def _cache_put(self, key: SessionKey, cached: _CachedSession) -> None:
+        self._sessions[key] = cached
+        self._sessions.move_to_end(key)
+        if len(self._sessions) <= self.max_cached_sessions:
+            return
+        # Evict the least recently used sessions that have nothing left to flush.
+        for old_key in list(self._sessions):
+            if len(self._sessions) <= self.max_cached_sessions:
+                break
+            if old_key != key and self._sessions[old_key].pending_writes == 0:
+                del self._sessions[old_key]
+
+    def _enqueue(self, op: tuple, owner: Optional[_CachedSession] = None) -> None:
+        """Queue a write; ``owner`` is the cache entry that stays pinned until it is flushed."""
+        if owner is not None:
+            owner.pending_writes += 1
+        self._writes.put((op, owner))
+
+    def _read(self, sql: str, params: tuple) -> List[tuple]:
+        with self._reader_lock:
+            return self._reader.execute(sql, params).fetchall()
+
+    def _load_session(self, key: SessionKey) -> Optional[_CachedSession]:
+        app_name, user_id, session_id = key
+        rows = self._read(
+            "SELECT state, last_update_time FROM sessions WHERE app_name = ? AND user_id = ? AND id = ?", key
+        )
+        if not rows:
+            return None
+        events = self._read(
+            "SELECT seq, event FROM events WHERE app_name = ? AND user_id = ? AND session_id = ? ORDER BY seq", key
+        )
+        session = Session(
+            app_name=app_name,
+            user_id=user_id,
+            id=session_id,
+            state=json.loads(rows[0][0]),
+            events=[Event.model_validate_json(event) for _, event in events],
+            last_update_time=rows[0][1],
+        )
+        return _CachedSession(session, next_seq=events[-1][0] + 1 if events else 0)
+
+    async def _get_cached(self, key: SessionKey) -> Optional[_CachedSession]:
+        with self._lock:
+            cached = self._sessions.get(key)
+            if cached is not None:
+                self._sessions.move_to_end(key)
+                self.cache_hits += 1
+                return cached
+            if key in self._pending_deletes:
+                return None
+            self.cache_misses += 1
+        loaded = await asyncio.to_thread(self._load_session, key)
+        if loaded is None:
+            return None
+        with self._lock:
+            # Another caller may have loaded or created it meanwhile; keep theirs.
+            cached = self._sessions.get(key)
+            if cached is None:
+                self._cache_put(key, loaded)
+                cached = loaded
+            return cached
+
+    def _load_scoped_state(self, app_name: str, user_id: str) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        app_rows = self._read("SELECT state FROM app_states WHERE app_name = ?", (app_name,))
+        user_rows = self._read("SELECT state FROM user_states WHERE app_name = ? AND user_id = ?", (app_name, user_id))
+        return (json.loads(app_rows[0][0]) if app_rows else {}, json.loads(user_rows[0][0]) if user_rows else {})
+
+    async def _scoped_state(self, app_name: str, user_id: str) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        with self._lock:
+            if app_name in self._app_states and (app_name, user_id) in self._user_states:
+                return self._app_states[app_name], self._user_states[(app_name, user_id)]
+        app_state, user_state = await asyncio.to_thread(self._load_scoped_state, app_name, user_id)
+        with self._lock:
+            return (
+                self._app_states.setdefault(app_name, app_state),
+                self._user_states.setdefault((app_name, user_id), user_state),
+            )
+
+    def _update_scoped_state(self, app_name: str, user_id: str, app_delta: Dict[str, Any], user_delta: Dict[str, Any]) -> None:
+        """Apply app:/user: deltas to the cache and queue them; call with the lock held."""
+        if app_delta:
+            self._app_states[app_name].update(app_delta)
+            self._enqueue(("app_state", app_name, json.dumps(self._app_states[app_name], default=str)))
+        if user_delta:
+            self._user_states[(app_name, user_id)].update(user_delta)
+            self._enqueue(("user_state", app_name, user_id, json.dumps(self._user_states[(app_name, user_id)], default=str)))
+
+    def _view(self, session: Session, app_state: Dict[str, Any], user_state: Dict[str, Any], events: List[Event]) -> Session:
+        """A copy of a cached session with app and user state merged in."""
+        copied = session.model_copy(deep=False)
+        copied.events = list(events)
+        copied.state = dict(session.state)
+        copied.state.update({State.APP_PREFIX + key: value for key, value in app_state.items()})
+        copied.state.update({State.USER_PREFIX + key: value for key, value in user_state.items()})
+        return copied
+
+    # --- BaseSessionService ---
+
+    async def create_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        state: Optional[Dict[str, Any]] = None,
+        session_id: Optional[str] = None,
+    ) -> Session:
+        session_id = session_id.strip() if session_id else None
+        if session_id and await self._get_cached((app_name, user_id, session_id)) is not None:
+            raise AlreadyExistsError(f"Session with id {session_id} already exists.")
+        session_id = session_id or str(uuid.uuid4())
+        key = (app_name, user_id, session_id)
+        app_delta, user_delta, session_state = _split_state(state or {})
+        app_state, user_state = await self._scoped_state(app_name, user_id)
+        session = Session(app_name=app_name, user_id=user_id, id=session_id, state=session_state, last_update_time=time.time())
+        with self._lock:
+            cached = _CachedSession(session, next_seq=0)
+            self._cache_put(key, cached)
+            self._enqueue(("session", key, json.dumps(session_state, default=str), session.last_update_time), cached)
+            self._update_scoped_state(app_name, user_id, app_delta, user_delta)
+            return self._view(session, app_state, user_state, [])
+
+    async def get_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        session_id: str,
+        config: Optional[GetSessionConfig] = None,
+    ) -> Optional[Session]:
+        key = (app_name, user_id, session_id.strip() if session_id else session_id)
+        cached = await self._get_cached(key)
+        if cached is None:
+            return None
+        app_state, user_state = await self._scoped_state(app_name, user_id)
+        with self._lock:
+            events = cached.session.events
+            if config and config.num_recent_events is not None:
+                events = events[-config.num_recent_events:] if config.num_recent_events else []
+            if config and config.after_timestamp is not None:
+                events = [event for event in events if event.timestamp >= config.after_timestamp]
+            return self._view(cached.session, app_state, user_state, events)
+
+    async def list_sessions(self, *, app_name: str, user_id: Optional[str] = None) -> ListSessionsResponse:
+        # Listing reads the database, so make it current first.
+        await self.flush()
+        if user_id is None:
+            rows = await asyncio.to_thread(
+                self._read, "SELECT user_id, id, state, last_update_time FROM sessions WHERE app_name = ?", (app_name,)
+            )
+        else:
+            rows = await asyncio.to_thread(
+                self._read,
+                "SELECT user_id, id, state, last_update_time FROM sessions WHERE app_name = ? AND user_id = ?",
+                (app_name, user_id),
+            )
+        sessions = []
+        for row_user_id, session_id, state, last_update_time in rows:
+            app_state, user_state = await self._scoped_state(app_name, row_user_id)
+            session = Session(app_name=app_name, user_id=row_user_id, id=session_id,
+                              state=json.loads(state), last_update_time=last_update_time)
+            sessions.append(self._view(session, app_state, user_state, []))
+        sessions.sort(key=lambda s: (s.last_update_time, s.user_id, s.id))
+        return ListSessionsResponse(sessions=sessions)
+
+    async def delete_session(self, *, app_name: str, user_id: str, session_id: str) -> None:
+        key = (app_name, user_id, session_id.strip() if session_id else session_id)
+        with self._lock:
+            self._sessions.pop(key, None)
+            # Until the delete is flushed, a cache miss must not reload the session from disk.
+            self._pending_deletes[key] = self._pending_deletes.get(key, 0) + 1
+            self._enqueue(("delete", key))
+
+    async def get_user_state(self, *, app_name: str, user_id: str) -> Dict[str, Any]:
+        _, user_state = await self._scoped_state(app_name, user_id)
+        with self._lock:
+            return dict(user_state)
+
+    async def append_event(self, session: Session, event: Event) -> Event:
+        if event.partial:
+            return event
+        key = (session.app_name, session.user_id, session.id)
+        cached = await self._get_cached(key)
+        if cached is None:
+            raise SessionNotFoundError(f"Session {session.id} not found.")
+        await self._scoped_state(session.app_name, session.user_id)
+        # Updates the caller's session object: temp state, trimmed delta, event list.
+        event = await super().append_event(session, event)
+        app_delta, user_delta, session_delta = _split_state(event.actions.state_delta if event.actions else {})
+        with self._lock:
+            # Re-pin the session in case it was evicted while it was clean.
+            cached = self._sessions.get(key) or cached
+            self._cache_put(key, cached)
+            stored = cached.session
+            stored.state.update(session_delta)
+            stored.events.append(event)
+            stored.last_update_time = event.timestamp
+            if len(stored.events) > self.max_events_per_session:
+                del stored.events[:-self.max_events_per_session]
+            seq = cached.next_seq
+            cached.next_seq += 1
+            self._enqueue((
+                "event", key, seq, event.model_dump_json(exclude_none=True),
+                json.dumps(stored.state, default=str), stored.last_update_time,
+            ), cached)
+            self._update_scoped_state(session.app_name, session.user_id, app_delta, user_delta)
+        return event
+
+    async def flush(self) -> None:
+        """Wait until every write queued so far is committed.
+
+        Raises the database error if a batch queued since the last flush failed.
+        """
+        done: Future = Future()
+        self._writes.put((("marker", done), None))
+        await asyncio.wrap_future(done)
+
+    async def close(self) -> None:
+        """Flush pending writes and stop the flusher thread."""
+        try:
+            await self.flush()
+        finally:
+            self._writes.put((("stop",), None))
+            await asyncio.to_thread(self._flusher.join)
+            with self._reader_lock:
+                self._reader.close()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.cache_hits + self.cache_misses
+            return {
+                "cached_sessions": len(self._sessions),
+                "cache_hit_rate": self.cache_hits / lookups if lookups else 0.0,
+                "pending_writes": self._writes.qsize(),
+                "flushed_batches": self.flushed_batches,
+                "flushed_writes": self.flushed_writes,
+                "failed_writes": self.failed_writes,
+                "avg_batch_size": self.flushed_writes / self.flushed_batches if self.flushed_batches else 0.0,
+                "compacted_events": self.compacted_events,
+            }
+
+    # --- Background flusher ---
+
+    def _flush_loop(self, conn: sqlite3.Connection) -> None:
+        error: Optional[BaseException] = None
+        while True:
+            batch = [self._writes.get()]
+            deadline = time.monotonic() + self.flush_interval_seconds
+            while len(batch) < self.batch_size and batch[-1][0][0] not in ("marker", "stop"):
+                try:
+                    batch.append(self._writes.get(timeout=max(0.0, deadline - time.monotonic())))
+                except queue.Empty:
+                    break
+            ops = [(op, owner) for op, owner in batch if op[0] not in ("marker", "stop")]
+            try:
+                self._write_batch(conn, [op for op, _ in ops])
+            except Exception as e:
+                # Keep the flusher alive; the writes of this batch are lost and the next flush() raises.
+                logger.exception("Failed to write %d session writes to %s", len(ops), self.database_path)
+                error = e
+                with self._lock:
+                    self.failed_writes += len(ops)
+            finally:
+                self._release(ops)
+            for op, _ in batch:
+                if op[0] == "marker":
+                    if error is not None:
+                        op[1].set_exception(error)
+                    else:
+                        op[1].set_result(None)
+            if any(op[0] == "marker" for op, _ in batch):
+                error = None
+            if batch[-1][0][0] == "stop":
+                conn.close()
+                return
+
+    def _release(self, ops: List[tuple]) -> None:
+        """Unpin the cache entries and pending deletes of a batch that was written or failed."""
+        with self._lock:
+            for op, owner in ops:
+                if owner is not None:
+                    # Counted on the entry itself, so a re-created session under the same key is not affected.
+                    owner.pending_writes -= 1
+                if op[0] == "delete":
+                    key = op[1]
+                    self._pending_deletes[key] -= 1
+                    if not self._pending_deletes[key]:
+                        del self._pending_deletes[key]
+
+    def _write_batch(self, conn: sqlite3.Connection, ops: List[tuple]) -> None:
+        if not ops:
+            return
+        session_rows: Dict[SessionKey, tuple] = {}
+        app_rows: Dict[str, str] = {}
+        user_rows: Dict[Tuple[str, str], str] = {}
+        compactions: Dict[SessionKey, int] = {}
+        with conn:
+            for op in ops:
+                kind = op[0]
+                if kind == "session":
+                    _, key, state, last_update_time = op
+                    session_rows[key] = (state, last_update_time)
+                elif kind == "event":
+                    _, key, seq, event, state, last_update_time = op
+                    conn.execute("INSERT OR REPLACE INTO events VALUES (?, ?, ?, ?, ?)", (*key, seq, event))
+                    # Only the last state of each session in the batch is written.
+                    session_rows[key] = (state, last_update_time)
+                    # Compact in steps of half the limit so it does not run on every event.
+                    keep = self.max_events_per_session
+                    if seq + 1 > keep and (seq + 1) % max(1, keep // 2) == 0:
+                        compactions[key] = seq + 1 - keep
+                elif kind == "app_state":
+                    app_rows[op[1]] = op[2]
+                elif kind == "user_state":
+                    user_rows[(op[1], op[2])] = op[3]
+                elif kind == "delete":
+                    key = op[1]
+                    # Writes for the session queued before its delete are dropped.
+                    session_rows.pop(key, None)
+                    compactions.pop(key, None)
+                    conn.execute("DELETE FROM sessions WHERE app_name = ? AND user_id = ? AND id = ?", key)
+                    conn.execute("DELETE FROM events WHERE app_name = ? AND user_id = ? AND session_id = ?", key)
+            conn.executemany(
+                "INSERT OR REPLACE INTO sessions VALUES (?, ?, ?, ?, ?)",
+                [(*key, state, last_update_time) for key, (state, last_update_time) in session_rows.items()],
+            )
+            conn.executemany("INSERT OR REPLACE INTO app_states VALUES (?, ?)", list(app_rows.items()))
+            conn.executemany(
+                "INSERT OR REPLACE INTO user_states VALUES (?, ?, ?)",
+                [(app_name, user_id, state) for (app_name, user_id), state in user_rows.items()],
+            )
+            compacted = 0
+            for key, first_kept in compactions.items():
+                compacted += conn.execute(
+                    "DELETE FROM events WHERE app_name = ? AND user_id = ? AND session_id = ? AND seq < ?",
+                    (*key, first_kept),
+                ).rowcount
+        with self._lock:
+            self.flushed_batches += 1
+            self.flushed_writes += len(ops)
+            self.compacted_events += compacted
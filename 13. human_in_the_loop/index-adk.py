@@ -2,12 +2,13 @@ from google.adk.agents import Agent
 from google.adk.tools.tool_context import ToolContext
 from google.adk.agents.callback_context import CallbackContext
 from google.adk.models import LlmRequest
-import uuid
+import asyncio
 from google.adk.runners import InMemoryRunner
 
 from google.genai import types
 from typing import Optional
 from dotenv import load_dotenv
+from runner_service import RunnerService, final_response_text
 
 
 # Load environment variables from .env file
@@ -71,43 +72,21 @@ def personalization_callback( callback_context: CallbackContext, llm_request: Ll
 
     return None # Return None to continue with the modified request
 
-async def run_coordinator(runner: InMemoryRunner, request: str):
-    user_id = "user234"
-    session_id = str(uuid.uuid4())
-    await runner.session_service.create_session(
-        app_name=runner.app_name, user_id=user_id, session_id=session_id
-    )
+# Long-lived service: one runner, pre-warmed sessions and a fully async run path.
+support_service = RunnerService(InMemoryRunner(technical_support_agent), max_concurrency=32, pool_size=8)
 
-    events = runner.run(
-        user_id=user_id,
-        session_id=session_id,
-        new_message=types.Content(
-            role='user',
-            parts=[types.Part(text=request)]
-        ),
-    )
+async def run_coordinator(request: str) -> str:
+    event = await support_service.run(request)
+    return final_response_text(event)
 
-    for event in events:
-        if event.is_final_response() and event.content:
-            # Try to get text from event.content.text or from parts
-            if getattr(event.content, 'text', None):
-                return event.content.text
-            text_parts = [part.text for part in getattr(event.content, 'parts', []) if getattr(part, 'text', None)]
-            if text_parts:
-                return " ".join(text_parts)
-    return "No response received."
-    
 async def main():
-    runner = InMemoryRunner(technical_support_agent)
+    await support_service.start()
     request = "My computer is showing -100 percent CPU usage. Can you help me it seems like a very complex issue to me? Please escalate to human"
-    response = await run_coordinator(runner, request)
+    response = await run_coordinator(request)
     print(f"Response: {response}")
+    print(f"Service metrics: {support_service.metrics()}")
 
-    if hasattr(runner, "shutdown"):
-        await runner.shutdown()
-    elif hasattr(runner, "close"):
-        await runner.close()
+    await support_service.close()
 
 if __name__ == "__main__":
-    import asyncio
-    asyncio.run(main())
\ No newline at end of file
+    asyncio.run(main())
@@ -0,0 +1,301 @@
+"""
+Gemini Stub Server
+
+An offline stand-in for the Gemini API (generateContent, streamGenerateContent
+and countTokens) for load-testing the patterns in this repository without
+network access. Responses come from a script of regex rules, and every call
+is delayed according to a latency profile: time to first token, token rate,
+and rates of injected 429 and 500 errors.
+"""
+
+import argparse
+import json
+import math
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse, parse_qs
+
+# Built-in latency profiles. Time to first token is log-normally distributed
+# around ttft_median with spread ttft_sigma.
+PROFILES: Dict[str, Dict[str, float]] = {
+    "instant": {"ttft_median": 0.0, "ttft_sigma": 0.0, "tokens_per_second": 0, "error_rate": 0.0, "rate_limit_rate": 0.0},
+    "flash": {"ttft_median": 0.35, "ttft_sigma": 0.4, "tokens_per_second": 150, "error_rate": 0.002, "rate_limit_rate": 0.0},
+    "pro": {"ttft_median": 1.5, "ttft_sigma": 0.5, "tokens_per_second": 60, "error_rate": 0.005, "rate_limit_rate": 0.0},
+    "degraded": {"ttft_median": 2.0, "ttft_sigma": 0.9, "tokens_per_second": 30, "error_rate": 0.03, "rate_limit_rate": 0.1},
+}
+
+DEFAULT_RESPONSE = "Stub response from {model}: {prompt}"
+
+MODEL_PATH = re.compile(r"^/(?P<version>v1|v1beta|v1alpha)/models/(?P<model>[^:/]+):(?P<method>\w+)$")
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count, about four characters per token."""
+    return max(1, math.ceil(len(text) / 4)) if text else 0
+
+
+def system_text(body: dict) -> str:
+    """Text of the request's system instruction, if any."""
+    instruction = body.get("systemInstruction") or body.get("system_instruction") or {}
+    return "\n".join(part.get("text", "") for part in instruction.get("parts", []) if part.get("text"))
+
+
+def prompt_text(body: dict) -> str:
+    """Text of the last content in the request that has any text."""
+    for content in reversed(body.get("contents", [])):
+        texts = [part.get("text", "") for part in content.get("parts", []) if part.get("text")]
+        if texts:
+            return "\n".join(texts)
+    return ""
+
+
+class ResponseScript:
+    """Regex rules mapping prompts to scripted responses.
+
+    Each rule has a ``match`` regex for the latest prompt text and/or a
+    ``system`` regex for the system instruction; all given regexes must
+    match. It returns either a ``response`` template (``{model}`` and
+    ``{prompt}`` are substituted) or a ``function_call`` such as
+    ``{"name": ..., "args": {...}}``. The first matching rule wins.
+    """
+
+    def __init__(self, rules: Optional[List[dict]] = None, default: str = DEFAULT_RESPONSE):
+        flags = re.IGNORECASE | re.DOTALL
+        self.rules = [
+            (re.compile(rule.get("match", ""), flags), re.compile(rule.get("system", ""), flags), rule)
+            for rule in rules or []
+        ]
+        self.default = default
+
+    @classmethod
+    def from_file(cls, path: str) -> "ResponseScript":
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(data.get("rules", []), data.get("default", DEFAULT_RESPONSE))
+
+    def respond(self, model: str, prompt: str, system: str = "") -> dict:
+        """Return the response part for a prompt."""
+        rule = next(
+            (rule for prompt_pattern, system_pattern, rule in self.rules
+             if prompt_pattern.search(prompt) and system_pattern.search(system)),
+            None,
+        )
+        if rule is not None and "function_call" in rule:
+            return {"functionCall": rule["function_call"]}
+        template = rule["response"] if rule is not None else self.default
+        # str.replace rather than str.format so templates can contain JSON braces.
+        return {"text": template.replace("{model}", model).replace("{prompt}", prompt[:200])}
+
+
+class StubStats:
+    """Thread-safe request counters exposed on GET /stats."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counts: Dict[str, int] = {}
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def begin(self) -> None:
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+
+    def end(self, outcome: str) -> None:
+        with self._lock:
+            self.in_flight -= 1
+            self.counts[outcome] = self.counts.get(outcome, 0) + 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {"in_flight": self.in_flight, "max_in_flight": self.max_in_flight, **self.counts}
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Set by make_server()
+    profile: Dict[str, float] = PROFILES["flash"]
+    script: ResponseScript = ResponseScript()
+    stats: StubStats = StubStats()
+    rng: random.Random = random.Random()
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status: int, payload: dict) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_error(self, code: int, status: str, message: str) -> None:
+        self._send_json(code, {"error": {"code": code, "message": message, "status": status}})
+
+    def do_GET(self):
+        if urlparse(self.path).path == "/stats":
+            self._send_json(200, self.stats.snapshot())
+        else:
+            self._send_error(404, "NOT_FOUND", f"Unknown path {self.path}")
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        match = MODEL_PATH.match(url.path)
+        length = int(self.headers.get("Content-Length") or 0)
+        body = json.loads(self.rfile.read(length) or b"{}")
+        if match is None:
+            self._send_error(404, "NOT_FOUND", f"Unknown path {url.path}")
+            return
+
+        model, method = match.group("model"), match.group("method")
+        prompt = prompt_text(body)
+        if method == "countTokens":
+            self._send_json(200, {"totalTokens": estimate_tokens(json.dumps(body.get("contents", [])))})
+            return
+        if method not in ("generateContent", "streamGenerateContent"):
+            self._send_error(404, "NOT_FOUND", f"Unsupported method {method}")
+            return
+
+        self.stats.begin()
+        outcome = "ok"
+        try:
+            outcome = self._generate(model, prompt, body, stream=method == "streamGenerateContent",
+                                     sse=parse_qs(url.query).get("alt") == ["sse"])
+        finally:
+            self.stats.end(outcome)
+
+    def _sample_ttft(self) -> float:
+        median, sigma = self.profile["ttft_median"], self.profile["ttft_sigma"]
+        if median <= 0:
+            return 0.0
+        return self.rng.lognormvariate(math.log(median), sigma)
+
+    def _generate(self, model: str, prompt: str, body: dict, stream: bool, sse: bool) -> str:
+        roll = self.rng.random()
+        if roll < self.profile["rate_limit_rate"]:
+            self._send_error(429, "RESOURCE_EXHAUSTED", "Resource has been exhausted (e.g. check quota).")
+            return "rate_limited"
+        if roll < self.profile["rate_limit_rate"] + self.profile["error_rate"]:
+            time.sleep(self._sample_ttft())
+            self._send_error(500, "INTERNAL", "An internal error has occurred.")
+            return "error"
+
+        part = self.script.respond(model, prompt, system_text(body))
+        prompt_tokens = estimate_tokens(json.dumps(body.get("contents", [])))
+        output_tokens = estimate_tokens(part.get("text", json.dumps(part)))
+        tokens_per_second = self.profile["tokens_per_second"]
+        time.sleep(self._sample_ttft())
+
+        if not stream or "text" not in part:
+            if tokens_per_second > 0:
+                time.sleep(output_tokens / tokens_per_second)
+            self._send_json(200, self._response(model, [part], prompt_tokens, output_tokens, "STOP"))
+            return "ok"
+
+        # Stream the text in chunks of about eight tokens at the profile's token rate.
+        text = part["text"]
+        chunk_chars = 32
+        chunks = [text[i:i + chunk_chars] for i in range(0, len(text), chunk_chars)] or [""]
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream" if sse else "application/json")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        if not sse:
+            self._write_chunk(b"[")
+        for i, chunk in enumerate(chunks):
+            if i and tokens_per_second > 0:
+                time.sleep(estimate_tokens(chunk) / tokens_per_second)
+            last = i == len(chunks) - 1
+            payload = json.dumps(self._response(
+                model, [{"text": chunk}], prompt_tokens, output_tokens if last else None, "STOP" if last else None
+            ))
+            if sse:
+                self._write_chunk(f"data: {payload}\r\n\r\n".encode("utf-8"))
+            else:
+                self._write_chunk(((", " if i else "") + payload).encode("utf-8"))
+        if not sse:
+            self._write_chunk(b"]")
+        self._write_chunk(b"")
+        return "ok"
+
+    def _write_chunk(self, data: bytes) -> None:
+        self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+        self.wfile.flush()
+
+    @staticmethod
+    def _response(model: str, parts: List[dict], prompt_tokens: int, output_tokens: Optional[int], finish_reason: Optional[str]) -> dict:
+        candidate = {"content": {"role": "model", "parts": parts}, "index": 0}
+        if finish_reason:
+            candidate["finishReason"] = finish_reason
+        response = {"candidates": [candidate], "modelVersion": model}
+        if output_tokens is not None:
+            response["usageMetadata"] = {
+                "promptTokenCount": prompt_tokens,
+                "candidatesTokenCount": output_tokens,
+                "totalTokenCount": prompt_tokens + output_tokens,
+            }
+        return response
+
+
+def load_profile(name_or_path: str, overrides: Dict[str, float]) -> Dict[str, float]:
+    """Return a built-in profile or one read from a JSON file, with overrides applied."""
+    if name_or_path in PROFILES:
+        profile = dict(PROFILES[name_or_path])
+    else:
+        with open(name_or_path, "r", encoding="utf-8") as f:
+            profile = {**PROFILES["instant"], **json.load(f)}
+    profile.update({key: value for key, value in overrides.items() if value is not None})
+    return profile
+
+
+def make_server(host: str, port: int, profile: Dict[str, float], script: ResponseScript, seed: Optional[int] = None) -> Tuple[ThreadingHTTPServer, StubStats]:
+    """Create (but do not start) a stub server."""
+    stats = StubStats()
+    handler = type("ConfiguredStubHandler", (StubHandler,), {
+        "profile": profile,
+        "script": script,
+        "stats": stats,
+        "rng": random.Random(seed),
+    })
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server, stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline stand-in for the Gemini API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--profile", default="flash", help=f"one of {', '.join(PROFILES)} or a JSON file")
+    parser.add_argument("--script", help="JSON file with scripted response rules")
+    parser.add_argument("--seed", type=int, help="seed for reproducible latency and error sampling")
+    parser.add_argument("--ttft-median", type=float, help="override the profile's median time to first token (s)")
+    parser.add_argument("--tokens-per-second", type=float, help="override the profile's output token rate")
+    parser.add_argument("--error-rate", type=float, help="override the fraction of 500 responses")
+    parser.add_argument("--rate-limit-rate", type=float, help="override the fraction of 429 responses")
+    args = parser.parse_args()
+
+    profile = load_profile(args.profile, {
+        "ttft_median": args.ttft_median,
+        "tokens_per_second": args.tokens_per_second,
+        "error_rate": args.error_rate,
+        "rate_limit_rate": args.rate_limit_rate,
+    })
+    script = ResponseScript.from_file(args.script) if args.script else ResponseScript()
+    server, _ = make_server(args.host, args.port, profile, script, args.seed)
+    print(f"Gemini stub listening on http://{args.host}:{args.port} with profile {profile}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
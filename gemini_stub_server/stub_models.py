@@ -0,0 +1,22 @@
+"""
+Stub Models - Point LangChain and ADK Gemini models at the local stub server
+"""
+
+import os
+
+STUB_BASE_URL = os.getenv("GEMINI_STUB_URL", "http://127.0.0.1:8089")
+
+
+def stub_chat_model(model: str = "gemini-2.0-flash", base_url: str = STUB_BASE_URL, **kwargs):
+    """Return a ChatGoogleGenerativeAI that talks to the stub server instead of Gemini."""
+    from langchain_google_genai import ChatGoogleGenerativeAI
+
+    return ChatGoogleGenerativeAI(model=model, api_key="stub", base_url=base_url, max_retries=0, **kwargs)
+
+
+def stub_adk_model(model: str = "gemini-2.0-flash", base_url: str = STUB_BASE_URL):
+    """Return an ADK Gemini model for LlmAgent(model=...) that talks to the stub server."""
+    from google.adk.models import Gemini
+
+    os.environ.setdefault("GOOGLE_API_KEY", "stub")
+    return Gemini(model=model, base_url=base_url)